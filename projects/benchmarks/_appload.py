@@ -0,0 +1,38 @@
+"""
+Load the numerical core of a Streamlit app without running the page.
+
+Importing an app module calls st.set_page_config and renders the UI, so this
+parses app.py and executes only its imports (minus UI and network libraries),
+functions and classes not wrapped in a Streamlit cache, and
+UPPER_CASE constants.
+"""
+import ast
+import types
+from pathlib import Path
+
+PROJECTS = Path(__file__).resolve().parents[1]
+_SKIP_MODULES = {"streamlit", "yfinance", "plotly", "requests"}
+
+
+def _keep(node: ast.stmt) -> bool:
+    if isinstance(node, ast.Import):
+        return not any(a.name.split(".")[0] in _SKIP_MODULES for a in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return (node.module or "").split(".")[0] not in _SKIP_MODULES
+    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+        # st.cache_data / st.cache_resource wrappers are UI-side data loaders
+        return not any("st." in ast.unparse(d) for d in node.decorator_list)
+    if isinstance(node, ast.Assign):
+        return all(isinstance(t, ast.Name) and t.id.lstrip("_").isupper() for t in node.targets)
+    return False
+
+
+def load_app(name: str) -> types.ModuleType:
+    """Math-only module for projects/<name>/app.py."""
+    path = PROJECTS / name / "app.py"
+    tree = ast.parse(path.read_text(), filename=str(path))
+    body = [node for node in tree.body if _keep(node)]
+    module = types.ModuleType(f"{name.replace('-', '_')}_core")
+    module.__file__ = str(path)
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(path), "exec"), module.__dict__)
+    return module
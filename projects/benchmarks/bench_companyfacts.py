@@ -0,0 +1,76 @@
+"""
+json.loads vs the selective streaming parser on the largest companyfacts
+payloads: parse time and peak traced memory while reading the METRICS
+concepts the edgar-app uses. Peaks exclude the raw bytes, which both hold
+here; streamed from HTTP, the selective parser never holds the whole body.
+
+With --archive, the ten largest members of a local SEC companyfacts.zip (the
+bulk download factstore ingests) are used; otherwise synthetic payloads of
+comparable size (roughly 7-70 MB).
+
+    python projects/benchmarks/bench_companyfacts.py --archive ~/sec-bulk/companyfacts.zip [--top 10]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+from _appload import load_app
+import synthetic
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from edgar_core.factparse import select_facts
+
+CHUNK = 1 << 16  # requests' iter_content size used by the app
+
+
+def _payloads(archive, top: int, concepts: tuple):
+    """Yield (label, raw bytes) for the largest archive members or synthetic stand-ins."""
+    if archive:
+        with zipfile.ZipFile(archive) as zf:
+            for info in sorted(zf.infolist(), key=lambda i: i.file_size, reverse=True)[:top]:
+                yield Path(info.filename).stem, zf.read(info)
+        return
+    for n in (500, 1_000, 2_000, 3_000, 5_000)[:top]:
+        yield f"synthetic/concepts={n}", json.dumps(synthetic.companyfacts(n, concepts=concepts)).encode()
+
+
+def _run(fn) -> tuple:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1e3, peak / 2**20
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--archive", help="local companyfacts.zip")
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    edgar = load_app("edgar-app")
+    concepts = tuple(c for aliases in edgar.METRICS.values() for c in aliases)
+
+    print(f"{'payload':<28} {'MB':>6} {'loads ms':>9} {'loads MiB':>10} {'select ms':>10} "
+          f"{'select MiB':>11} {'speedup':>8} {'same':>5}")
+    for label, data in _payloads(args.archive, args.top, concepts):
+        chunks = lambda: (data[i:i + CHUNK] for i in range(0, len(data), CHUNK))
+        full_ms, full_mib = _run(lambda: json.loads(data))
+        sel_ms, sel_mib = _run(lambda: select_facts(chunks(), concepts))
+
+        full = json.loads(data)["facts"].get("us-gaap", {})
+        picked = select_facts(chunks(), concepts)["facts"]["us-gaap"]
+        same = picked == {c: full[c] for c in concepts if c in full}
+        print(f"{label:<28} {len(data) / 1e6:>6.1f} {full_ms:>9.0f} {full_mib:>10.1f} {sel_ms:>10.0f} "
+              f"{sel_mib:>11.1f} {full_ms / sel_ms:>7.1f}x {'yes' if same else 'NO':>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Runtime and bias of the fractal_core Hurst estimators on synthetic fractional Gaussian
+noise with known H.
+
+    python projects/benchmarks/bench_estimators.py [--paths 100] [--seed 0]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from synthetic import fgn_prices
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fractal_core import HURST_ESTIMATORS
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--paths", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>6} {'H':>4}  {'estimator':<20} {'bias':>7} {'std':>6} {'ms/series':>10}")
+    for n in (256, 1024, 4096):
+        for H in (0.3, 0.5, 0.7):
+            P = fgn_prices(args.paths, n, H, rng)
+            for name, est in HURST_ESTIMATORS.items():
+                t0 = time.perf_counter()
+                h = est(P)
+                ms = (time.perf_counter() - t0) * 1e3 / args.paths
+                print(f"{n:>6} {H:>4}  {name:<20} {np.nanmean(h) - H:>+7.3f} {np.nanstd(h):>6.3f} {ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
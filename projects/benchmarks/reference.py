@@ -0,0 +1,36 @@
+"""
+Pre-vectorization implementations kept as benchmark baselines, so a speedup
+quoted in a commit can be re-measured on the current machine. Copied
+verbatim from the apps before the change; not used by any app.
+"""
+import numpy as np
+
+
+def rs_core_loop(prices: np.ndarray, min_chunk: int = 20):
+    """
+    _rs_core before the chunk loop was vectorized: one NumPy call per chunk.
+    Returns (chunk_sizes, mean_rs_per_size).
+    """
+    log_ret = np.diff(np.log(np.maximum(prices, 1e-12)))
+    n = len(log_ret)
+
+    # Generate chunk sizes: n//2, n//3, ... down to min_chunk
+    sizes = sorted(set(n // k for k in range(2, n + 1) if n // k >= min_chunk))
+    if len(sizes) < 3:
+        return [], []
+
+    ns, rs_means = [], []
+    for size in sizes:
+        rs_list = []
+        for start in range(0, n - size + 1, size):
+            chunk = log_ret[start : start + size]
+            dev = np.cumsum(chunk - chunk.mean())
+            R = dev.max() - dev.min()
+            S = chunk.std(ddof=1)
+            if S > 0:
+                rs_list.append(R / S)
+        if rs_list:
+            ns.append(size)
+            rs_means.append(float(np.mean(rs_list)))
+
+    return ns, rs_means
@@ -0,0 +1,267 @@
+"""
+Offline benchmark suite for the numerical cores of the apps.
+
+Runs each function on deterministic synthetic inputs (random walk, trending
+fBm, mean-reverting OU price paths; synthetic companyfacts payloads) and
+reports wall time, peak traced memory and net allocated blocks. Results go to
+JSON so two commits can be diffed:
+
+    python projects/benchmarks/run.py --out base.json
+    python projects/benchmarks/run.py --out head.json --compare base.json
+
+--quick drops the largest sizes; --filter keeps cases whose name contains
+the given substring. Cases named "... (loop ref)" time the implementation a
+vectorized function replaced, on the same inputs, to reproduce the speedup.
+"""
+import argparse
+import functools
+import json
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from _appload import load_app
+import reference
+import synthetic
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from edgar_core import FactIndex, factstore, select_facts
+from fractal_core import backtest, bands, hurst, stream, sweep
+
+SLOW = {"rolling_hurst_series", "_rs_core (loop ref)"}
+
+
+def _once(build, *args, **kwargs):
+    """Zero-arg thunk for build(*args, **kwargs), run on first call only."""
+    return functools.cache(functools.partial(build, *args, **kwargs))
+
+
+def _frame(make, n: int, seed: int):
+    return synthetic.ohlcv_frame(make(n, seed=seed))
+
+
+def _round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+def _cases(quick: bool):
+    """
+    Yield (function name, case label, setup). setup() builds the case's
+    inputs and returns the zero-arg callable to time, so cases dropped by
+    --filter build nothing; inputs shared between cases are built once.
+    """
+    lengths = (1_000, 10_000) if quick else (1_000, 10_000, 100_000)
+    for kind, make in synthetic.PATHS.items():
+        for n in lengths:
+            prices = _once(make, n, seed=n)
+            yield "_rs_core", f"{kind}/n={n}", lambda p=prices: functools.partial(hurst._rs_core, p())
+            yield "hurst_rs", f"{kind}/n={n}", lambda p=prices: functools.partial(hurst.hurst_rs, p())
+            if kind == "rw":
+                yield ("_rs_core (loop ref)", f"{kind}/n={n}",
+                       lambda p=prices: functools.partial(reference.rs_core_loop, p()))
+
+    for kind, make in synthetic.PATHS.items():
+        for n in ((2_500,) if quick else (2_500, 10_000)):
+            prices = _once(make, n, seed=n)
+            for window in (252, 504):
+                yield ("rolling_hurst_series", f"{kind}/n={n}/w={window}",
+                       lambda p=prices, w=window: functools.partial(hurst.rolling_hurst_series, p(), w))
+
+    for n in ((5_000,) if quick else (5_000, 20_000)):
+        df = _once(_frame, synthetic.random_walk, n, n)
+        yield "compute_ranges", f"rw/n={n}", lambda d=df: functools.partial(bands.compute_ranges, d(), 0.6)
+
+    # Minute bars: windows of 8190/24570/98280 bars, still one O(n) pass each
+    bpy = 252 * bands.BARS_PER_DAY["1m"]
+    for n in ((200_000,) if quick else (200_000, 2_000_000)):
+        df = _once(_frame, synthetic.random_walk, n, n)
+        yield ("compute_range_pair", f"rw/1m/n={n}",
+               lambda d=df: functools.partial(bands.compute_range_pair, d(), 0.55, bpy))
+
+    # 20 years of daily bars, fractal and classical bands together
+    for kind, make in synthetic.PATHS.items():
+        df = _once(_frame, make, 20 * 252, 20)
+        yield ("compute_range_pair", f"{kind}/20y",
+               lambda d=df: functools.partial(bands.compute_range_pair, d(), 0.6))
+        yield ("rolling_band_h", f"{kind}/20y/w=252",
+               lambda d=df: functools.partial(bands.rolling_band_h, d()["Close"].values, 252))
+
+    def signals():
+        df = _frame(synthetic.random_walk, 10_000, 10)
+        return functools.partial(bands.signal_codes, df["Close"].values, bands.compute_ranges(df, 0.6))
+
+    yield "signal_codes", "rw/n=10000", signals
+
+    # Live minute bars into a warmed stream; cost per bar doesn't depend on
+    # the history, so the state carried over between repeats doesn't matter
+    def live_bars():
+        live = stream.BandStream(0.55, bpy)
+        live.seed(synthetic.random_walk(100_000, seed=23))
+        ticks = synthetic.random_walk(10_000, seed=24) * live.prev_close / 100
+        return lambda: [live.update(i, c) for i, c in enumerate(ticks)]
+
+    yield "BandStream.update", "rw/1m/bars=10000", live_bars
+
+    for kind, make in synthetic.PATHS.items():
+        df = _once(_frame, make, 20 * 252, 21)
+        yield "backtest_bands", f"{kind}/20y", lambda d=df: functools.partial(backtest.backtest_bands, d(), 0.6)
+
+    points = [(*t, src) for t in sweep.window_grid() for src in sweep.EXPONENT_SOURCES]
+    yield ("score_grid", f"rw/10y/points={len(points)}",
+           lambda: functools.partial(sweep.score_grid, synthetic.random_walk(10 * 252, seed=22), points))
+
+    # The app is loaded here rather than on first use: the labels need its metrics
+    edgar = load_app("edgar-app")
+    concepts = tuple(c for aliases in edgar.METRICS.values() for c in aliases)
+    for n_concepts in ((500,) if quick else (500, 2_000)):
+        facts = _once(synthetic.companyfacts, n_concepts, concepts=concepts)
+        index = _once(lambda f=facts: FactIndex.from_facts(f()))
+        raw = _once(lambda f=facts: json.dumps(f()).encode())
+
+        def walk(index=index):
+            i = index()
+
+            def run():
+                for aliases in edgar.METRICS.values():
+                    for concept in aliases:
+                        edgar.extract_annual_series(i, concept)
+            return run
+
+        def stream_select(raw=raw):
+            r = raw()
+            return lambda: select_facts((r[i:i + 65536] for i in range(0, len(r), 65536)), concepts)
+
+        yield "extract_annual_series", f"all-metrics/concepts={n_concepts}", walk
+        yield ("FactIndex.from_facts", f"concepts={n_concepts}",
+               lambda f=facts: functools.partial(FactIndex.from_facts, f()))
+        yield "json.loads", f"companyfacts/concepts={n_concepts}", lambda r=raw: functools.partial(json.loads, r())
+        yield "select_facts", f"all-metrics/concepts={n_concepts}", stream_select
+        # st.cache_data pickles on store and unpickles on every hit (each rerun)
+        for label, cached in (("raw-json", facts), ("fact-index", index)):
+            yield ("cache round trip", f"{label}/concepts={n_concepts}",
+                   lambda c=cached: functools.partial(_round_trip, c()))
+
+    # Bulk-archive ingest into a fresh store, then a peer-analysis read. The
+    # fixtures are removed once the cases are exhausted (or the run stops).
+    with tempfile.TemporaryDirectory(prefix="edgar-bulk-") as tmp:
+        fixtures = Path(tmp)
+        n_companies = 10 if quick else 40
+        archive = _once(lambda: synthetic.edgar_archives(fixtures, n_companies, 300, concepts)["companyfacts"])
+        stores = []
+
+        def ingest(db):
+            con = factstore.open_store(db)
+            factstore.ingest_archive(con, "companyfacts", archive())
+            con.close()
+
+        def fresh_ingest():
+            # Each run starts from an empty store and replaces the last one
+            for old in fixtures.glob("ingest.sqlite*"):
+                old.unlink()
+            ingest(fixtures / "ingest.sqlite")
+
+        def peer_read():
+            ingest(fixtures / "read.sqlite")
+            stores.append(factstore.open_store(fixtures / "read.sqlite", readonly=True))
+            return functools.partial(factstore.company_facts, stores[-1], 1000, concepts)
+
+        yield "ingest_archive", f"companyfacts/companies={n_companies}/concepts=300", lambda: fresh_ingest
+        try:
+            yield "company_facts", f"metrics/concepts={len(concepts)}", peer_read
+        finally:
+            for store in stores:
+                store.close()
+
+
+def _measure(fn, repeat: int) -> dict:
+    fn()  # warm caches (lru_cache grids, pandas internals)
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "wall_ms_min": round(min(times), 3),
+        "wall_ms_median": round(statistics.median(times), 3),
+        "peak_kib": round((peak - base) / 1024, 1),
+        "net_blocks": sys.getallocatedblocks() - blocks_before,
+    }
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def _compare(results: list, base_path: str, threshold: float) -> int:
+    base = {(r["name"], r["case"]): r for r in json.loads(Path(base_path).read_text())["results"]}
+    print(f"\n{'function':<24} {'case':<28} {'base ms':>9} {'head ms':>9} {'ratio':>7}  {'peak KiB':>17}")
+    regressions = 0
+    for r in results:
+        b = base.get((r["name"], r["case"]))
+        if b is None:
+            continue
+        ratio = r["wall_ms_min"] / b["wall_ms_min"] if b["wall_ms_min"] else float("inf")
+        flag = "  <-- slower" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"{r['name']:<24} {r['case']:<28} {b['wall_ms_min']:>9.2f} {r['wall_ms_min']:>9.2f} "
+              f"{ratio:>6.2f}x  {b['peak_kib']:>8.0f}->{r['peak_kib']:<8.0f}{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", help="baseline results JSON to diff against")
+    ap.add_argument("--threshold", type=float, default=0.10, help="slowdown flagged as a regression")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--quick", action="store_true")
+    ap.add_argument("--filter", default="")
+    args = ap.parse_args()
+
+    results = []
+    print(f"{'function':<24} {'case':<28} {'min ms':>9} {'median ms':>10} {'peak KiB':>9} {'blocks':>7}")
+    for name, case, setup in _cases(args.quick):
+        if args.filter not in f"{name}/{case}":
+            continue
+        fn = setup()
+        # Fewer repeats for cases that take seconds
+        m = _measure(fn, args.repeat if name not in SLOW else max(1, args.repeat // 2))
+        results.append({"name": name, "case": case, **m})
+        print(f"{name:<24} {case:<28} {m['wall_ms_min']:>9.2f} {m['wall_ms_median']:>10.2f} "
+              f"{m['peak_kib']:>9.0f} {m['net_blocks']:>7}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({"meta": _meta(), "results": results}, indent=2))
+    if args.compare:
+        sys.exit(1 if _compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Deterministic synthetic inputs for the benchmarks: price paths with known
+memory, SEC companyfacts payloads of configurable size and bulk-archive
+fixtures built from them.
+"""
+import json
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def fgn(n: int, H: float, rng: np.random.Generator) -> np.ndarray:
+    """Exact fractional Gaussian noise via circulant embedding (Davies-Harte)."""
+    k = np.arange(n + 1)
+    gamma = 0.5 * (np.abs(k + 1) ** (2 * H) - 2 * k ** (2 * H) + np.abs(k - 1) ** (2 * H))
+    row = np.concatenate([gamma, gamma[-2:0:-1]])
+    lam = np.maximum(np.fft.fft(row).real, 0)
+    w = rng.normal(size=len(row)) + 1j * rng.normal(size=len(row))
+    return np.fft.fft(np.sqrt(lam / len(row)) * w)[:n].real
+
+
+def fgn_prices(n_paths: int, n: int, H: float, rng: np.random.Generator) -> np.ndarray:
+    """(n_paths, n + 1) price matrix whose log returns are fGn with exponent H."""
+    ret = np.stack([fgn(n, H, rng) for _ in range(n_paths)]) * 0.01
+    return 100 * np.exp(np.concatenate([np.zeros((n_paths, 1)), np.cumsum(ret, axis=1)], axis=1))
+
+
+def random_walk(n: int, seed: int = 0) -> np.ndarray:
+    """Geometric random walk, H = 0.5."""
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def trending_fbm(n: int, seed: int = 0, H: float = 0.7) -> np.ndarray:
+    """Persistent path: log price is fractional Brownian motion with H > 0.5."""
+    return fgn_prices(1, n - 1, H, np.random.default_rng(seed))[0]
+
+
+def mean_reverting_ou(n: int, seed: int = 0, theta: float = 0.05) -> np.ndarray:
+    """Ornstein-Uhlenbeck log price around log(100), H < 0.5 at long lags."""
+    rng = np.random.default_rng(seed)
+    eps = rng.normal(0, 0.01, n)
+    x = np.empty(n)
+    x[0] = 0.0
+    for t in range(1, n):
+        x[t] = (1 - theta) * x[t - 1] + eps[t]
+    return 100 * np.exp(x)
+
+
+PATHS = {"rw": random_walk, "fbm": trending_fbm, "ou": mean_reverting_ou}
+
+
+def ohlcv_frame(close: np.ndarray, seed: int = 0) -> pd.DataFrame:
+    """Daily OHLCV frame around a close path, on a business-day index."""
+    rng = np.random.default_rng(seed)
+    n = len(close)
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    wick = np.abs(rng.normal(0, 0.005, (2, n))) * close
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + wick[0],
+        "Low": np.minimum(open_, close) - wick[1],
+        "Close": close,
+        "Volume": rng.integers(1e5, 1e7, n).astype(float),
+    }, index=pd.bdate_range("1990-01-01", periods=n, name="Date"))
+
+
+def companyfacts(n_concepts: int = 500, years: int = 15, quarters: bool = True,
+                 concepts: tuple = (), seed: int = 0) -> dict:
+    """
+    A companyfacts-shaped payload with n_concepts us-gaap concepts (the given
+    names first, then filler), each with FY 10-K rows, restated comparatives
+    and, optionally, 10-Q rows.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(concepts) + [f"SyntheticConcept{i:04d}" for i in range(max(0, n_concepts - len(concepts)))]
+    first_year = 2024 - years
+    us_gaap = {}
+    for name in names[:n_concepts]:
+        rows = []
+        for y in range(first_year, 2024):
+            filed = f"{y + 1}-02-15"
+            accn = f"0000000000-{(y + 1) % 100:02d}-{rng.integers(1e6):06d}"
+            # Each 10-K reports the year and restates the two prior years
+            for back in range(3):
+                fy_end = f"{y - back}-12-31"
+                rows.append({"start": f"{y - back}-01-01", "end": fy_end, "val": int(rng.integers(1e6, 1e11)),
+                             "accn": accn, "fy": y, "fp": "FY", "form": "10-K", "filed": filed})
+            if quarters:
+                for q, end in enumerate(("03-31", "06-30", "09-30"), start=1):
+                    rows.append({"start": f"{y}-01-01", "end": f"{y}-{end}", "val": int(rng.integers(1e6, 1e11)),
+                                 "accn": accn, "fy": y, "fp": f"Q{q}", "form": "10-Q", "filed": f"{y}-{end}"})
+        us_gaap[name] = {"label": name, "description": f"Synthetic {name}", "units": {"USD": rows}}
+    return {"cik": 1, "entityName": "SYNTHETIC CORP", "facts": {"us-gaap": us_gaap}}
+
+
+def edgar_archives(dest, n_companies: int = 50, n_concepts: int = 200, concepts: tuple = (), seed: int = 0) -> dict:
+    """
+    Write companyfacts.zip and submissions.zip fixtures shaped like the SEC
+    bulk archives (one CIK##########.json per company) into dest. Returns
+    {"companyfacts": path, "submissions": path}.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    paths = {kind: dest / f"{kind}.zip" for kind in ("companyfacts", "submissions")}
+    forms = ["10-K", "10-Q", "10-Q", "8-K", "8-K", "DEF 14A", "4"]
+    with zipfile.ZipFile(paths["companyfacts"], "w", zipfile.ZIP_DEFLATED) as cf, \
+            zipfile.ZipFile(paths["submissions"], "w", zipfile.ZIP_DEFLATED) as sub:
+        for i in range(n_companies):
+            cik = 1000 + i
+            member = f"CIK{cik:010d}.json"
+            facts = companyfacts(n_concepts, concepts=concepts, seed=seed + i)
+            facts.update(cik=cik, entityName=f"SYNTHETIC CORP {i}")
+            cf.writestr(member, json.dumps(facts))
+            n_filings = 60
+            sub.writestr(member, json.dumps({
+                "cik": f"{cik:010d}", "name": f"SYNTHETIC CORP {i}", "tickers": [f"SYN{i}"],
+                "sic": "7372", "sicDescription": "Services-Prepackaged Software",
+                "fiscalYearEnd": "1231", "stateOfIncorporation": "DE",
+                "filings": {"recent": {
+                    "accessionNumber": [f"0000{cik:06d}-24-{j:06d}" for j in range(n_filings)],
+                    "form": [forms[j % len(forms)] for j in range(n_filings)],
+                    "filingDate": [f"2024-{12 - j // 6:02d}-{28 - j % 6:02d}" for j in range(n_filings)],
+                    "primaryDocument": [f"doc{j}.htm" for j in range(n_filings)],
+                }},
+            }))
+    return paths
@@ -1,13 +1,17 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-import time
 import re
 import xml.etree.ElementTree as ET
 import urllib.parse
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from edgar_core import FactIndex, factstore, sec, select_facts
 
 # ── Page config ──────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -222,8 +226,6 @@ html, body, [class*="css"] {
 """, unsafe_allow_html=True)
 
 # ── Constants ─────────────────────────────────────────────────────────────────
-HEADERS = {"User-Agent": "Justin Louie edgar-peer-lens@gmail.com"}
-BASE_URL = "https://data.sec.gov"
 
 METRICS = {
     "Revenue": [
@@ -251,12 +253,35 @@ METRICS = {
     "Operating Cash Flow": ["NetCashProvidedByUsedInOperatingActivities"],
     "R&D Expense": ["ResearchAndDevelopmentExpense"],
 }
+# Every us-gaap concept the page reads; companyfacts are parsed down to these
+METRIC_CONCEPTS = [c for aliases in METRICS.values() for c in aliases]
 
 # ── SEC API helpers ───────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def _open_fact_store():
+    return factstore.open_store(readonly=True)
+
+
+def fact_store():
+    """
+    Read-only connection to the bulk-archive fact store, or None if it hasn't
+    been ingested. Only an existing store is cached, so an ingest made while
+    the app runs is picked up on the next call.
+    """
+    if not factstore.FACT_STORE.exists():
+        return None
+    return _open_fact_store()
+
+
 @st.cache_data(ttl=86400, show_spinner=False)
 def load_ticker_map():
-    url = "https://www.sec.gov/files/company_tickers.json"
-    r = requests.get(url, headers=HEADERS, timeout=15)
+    store = fact_store()
+    if store is not None:
+        # Empty when only the companyfacts archive was ingested: use the SEC's map
+        tickers = factstore.ticker_map(store)
+        if tickers:
+            return tickers
+    r = sec.get(sec.url("www", "/files/company_tickers.json"))
     data = r.json()
     return {
         v["ticker"]: {"cik": str(v["cik_str"]).zfill(10), "name": v["title"]}
@@ -264,46 +289,48 @@ def load_ticker_map():
     }
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def get_company_facts(cik: str):
-    url = f"{BASE_URL}/api/xbrl/companyfacts/CIK{cik}.json"
-    r = requests.get(url, headers=HEADERS, timeout=15)
-    if r.status_code == 200:
-        return r.json()
+def get_company_facts(cik: str, concepts=METRIC_CONCEPTS):
+    """
+    companyfacts for cik holding only the given us-gaap concepts, parsed
+    from the response stream without building the full payload. Callers go
+    through the cached get_fact_index.
+    """
+    store = fact_store()
+    if store is not None:
+        facts = factstore.company_facts(store, cik, concepts)
+        if facts is not None:
+            return facts
+    with sec.get(sec.url("data", f"/api/xbrl/companyfacts/CIK{cik}.json"), stream=True) as r:
+        if r.status_code == 200:
+            return select_facts(r.iter_content(1 << 16), concepts)
     return None
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def get_company_info(cik: str):
-    url = f"{BASE_URL}/submissions/CIK{cik}.json"
-    r = requests.get(url, headers=HEADERS, timeout=15)
+    store = fact_store()
+    if store is not None:
+        info = factstore.company_info(store, cik)
+        if info:
+            return info
+    r = sec.get(sec.url("data", f"/submissions/CIK{cik}.json"))
     if r.status_code == 200:
         return r.json()
     return None
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_fact_index(cik: str):
+    """Company facts parsed once into a FactIndex; None if the SEC has none."""
+    facts = get_company_facts(cik)
+    return FactIndex.from_facts(facts) if facts is not None else None
+
+
 def extract_annual_series(facts, concept):
     """Return list of (fiscal_year_end_date, value) for annual 10-K filings."""
-    try:
-        units = facts["facts"]["us-gaap"][concept]["units"]
-        for unit_type in ["USD", "shares"]:
-            if unit_type not in units:
-                continue
-            rows = [
-                d for d in units[unit_type]
-                if d.get("form") == "10-K" and d.get("fp") == "FY"
-            ]
-            if not rows:
-                continue
-            seen = {}
-            for d in rows:
-                year = d["end"][:4]
-                seen[year] = (d["end"], d["val"])
-            series = sorted(seen.values(), key=lambda x: x[0])
-            return series
-    except (KeyError, TypeError):
-        pass
-    return []
+    if not isinstance(facts, FactIndex):
+        facts = FactIndex.from_facts(facts)
+    return facts.annual_series(concept)
 
 
 def get_latest_annual(facts, concepts):
@@ -381,15 +408,15 @@ def search_edgar(query: str, forms: str, days_back: int = 180) -> list:
     from datetime import datetime, timedelta
     end = datetime.today()
     start = end - timedelta(days=days_back)
-    url = (
-        f"https://efts.sec.gov/LATEST/search-index?"
-        f"q={requests.utils.quote(query)}"
-        f"&forms={requests.utils.quote(forms)}"
+    url = sec.url("efts", (
+        f"/LATEST/search-index?"
+        f"q={urllib.parse.quote(query)}"
+        f"&forms={urllib.parse.quote(forms)}"
         f"&dateRange=custom"
         f"&startdt={start.strftime('%Y-%m-%d')}"
         f"&enddt={end.strftime('%Y-%m-%d')}"
-    )
-    r = requests.get(url, headers=HEADERS, timeout=15)
+    ))
+    r = sec.get(url)
     if r.status_code == 200:
         return r.json().get("hits", {}).get("hits", [])
     return []
@@ -421,17 +448,23 @@ ITEM_EMOJI = {
     "1.01": "📝", "1.02": "❌", "1.03": "⚠️", "2.01": "✅", "3.03": "🔒",
 }
 
+# Largest page the EDGAR current-filings feed serves
+RSS_PAGE = 100
+# Cap on 8-Ks read per scan (a busy day is several hundred)
+MONITOR_8K_MAX = 2000
+# 8-Ks read concurrently; the SEC client's token bucket sets the actual pace
+MONITOR_WORKERS = 8
+
 
 @st.cache_data(ttl=900, show_spinner=False)
-def get_recent_filings_rss(form_type: str, count: int = 40) -> list:
-    """Fetch recent filings from SEC EDGAR RSS/Atom feed."""
+def get_recent_filings_rss(form_type: str, count: int = 40, start: int = 0) -> list:
+    """Fetch recent filings from SEC EDGAR RSS/Atom feed, newest first, skipping the first start."""
     params = {
         "action": "getcurrent", "type": form_type,
         "company": "", "dateb": "", "owner": "include",
-        "count": str(count), "output": "atom",
+        "start": str(start), "count": str(count), "output": "atom",
     }
-    url = f"https://www.sec.gov/cgi-bin/browse-edgar?{urllib.parse.urlencode(params)}"
-    r = requests.get(url, headers=HEADERS, timeout=15)
+    r = sec.get(sec.url("www", f"/cgi-bin/browse-edgar?{urllib.parse.urlencode(params)}"))
     if r.status_code != 200:
         return []
     root = ET.fromstring(r.content)
@@ -457,16 +490,30 @@ def get_recent_filings_rss(form_type: str, count: int = 40) -> list:
     return filings
 
 
+def get_recent_8ks(cutoff: str, limit: int = MONITOR_8K_MAX) -> list:
+    """8-K feed entries filed on or after cutoff, paging back until the feed passes it."""
+    filings, seen = [], set()
+    for start in range(0, limit, RSS_PAGE):
+        page = get_recent_filings_rss("8-K", count=RSS_PAGE, start=start)
+        for f in page:
+            # Pages are cached separately, so a shifted feed can repeat entries
+            if f["filed_date"] >= cutoff and f["filing_url"] not in seen:
+                seen.add(f["filing_url"])
+                filings.append(f)
+        if len(page) < RSS_PAGE or page[-1]["filed_date"] < cutoff:
+            break
+    return filings[:limit]
+
+
 @st.cache_data(ttl=3600, show_spinner=False)
 def get_8k_items_cached(filing_url: str) -> list:
     """Fetch an 8-K filing index and extract Item numbers from the document."""
     try:
-        r = requests.get(filing_url, headers=HEADERS, timeout=12)
+        r = sec.get(filing_url, timeout=12)
         # Find the primary .htm document
         doc_match = re.search(r'href="(/Archives/edgar/data/[^"]+\.htm)"', r.text)
         if doc_match:
-            doc_url = "https://www.sec.gov" + doc_match.group(1)
-            r2 = requests.get(doc_url, headers=HEADERS, timeout=12)
+            r2 = sec.get(sec.url("www", doc_match.group(1)), timeout=12)
             matches = re.findall(r"Item\s+(\d+\.\d+)", r2.text, re.IGNORECASE)
             return sorted(set(matches))
     except Exception:
@@ -501,18 +548,25 @@ def run_smart_monitor(days_back: int, check_8ks: bool = True):
                 results["tender_offers"].append(f)
             elif "14D9" in form_type:
                 results["tender_offers"].append(f)
-        time.sleep(0.15)
 
     # ── 8-Ks: fetch and read item numbers ─────────────────────────────────────
     if check_8ks:
-        raw_8ks = get_recent_filings_rss("8-K", count=60)
-        recent_8ks = [f for f in raw_8ks if f["filed_date"] >= str(cutoff)]
-        for i, f in enumerate(recent_8ks):
-            yield ("progress", i, len(recent_8ks), f["company_name"])
-            items = get_8k_items_cached(f["filing_url"])
+        recent_8ks = get_recent_8ks(str(cutoff))
+        items_by_filing = [None] * len(recent_8ks)
+        pool = ThreadPoolExecutor(MONITOR_WORKERS)
+        try:
+            futures = {pool.submit(get_8k_items_cached, f["filing_url"]): i for i, f in enumerate(recent_8ks)}
+            for done, fut in enumerate(as_completed(futures), 1):
+                i = futures[fut]
+                items_by_filing[i] = fut.result()
+                yield ("progress", done, len(recent_8ks), recent_8ks[i]["company_name"])
+        finally:
+            # A rerun abandons this generator: drop the reads not yet started
+            pool.shutdown(cancel_futures=True)
+        # Categorize in feed order, whatever order the reads finished in
+        for f, items in zip(recent_8ks, items_by_filing):
             relevant = [it for it in items if it in RELEVANT_8K_ITEMS]
             if not relevant:
-                time.sleep(0.12)
                 continue
             for item in relevant:
                 name, desc = RELEVANT_8K_ITEMS[item]
@@ -523,7 +577,6 @@ def run_smart_monitor(days_back: int, check_8ks: bool = True):
                     results["acquisition_8k"].append(entry)
                 elif item in ("1.01", "1.02", "3.03"):
                     results["agreement_8k"].append(entry)
-            time.sleep(0.12)
 
     yield ("done", results)
 
@@ -684,9 +737,10 @@ with main_tab1:
                 continue
             meta = ticker_map[ticker]
             cik = meta["cik"]
-            facts = get_company_facts(cik)
+            facts = get_fact_index(cik)
             info = get_company_info(cik)
-            if facts:
+            # An empty index is still a company: its metrics show as "—"
+            if facts is not None:
                 company_data[ticker] = {
                     "name": meta["name"],
                     "cik": cik,
@@ -696,7 +750,6 @@ with main_tab1:
                     "fiscal_year_end": info.get("fiscalYearEnd", "—") if info else "—",
                     "state": info.get("stateOfIncorporation", "—") if info else "—",
                 }
-            time.sleep(0.12)
 
         progress.empty()
 
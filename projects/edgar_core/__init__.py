@@ -0,0 +1,34 @@
+"""
+Streamlit-free SEC EDGAR data layer for the edgar-app.
+
+The fact store and the selective companyfacts parser are standard library
+only, so ingest jobs run without the app's dependencies; the NumPy/pandas
+fact index loads on first attribute access. The SEC HTTP client (sec) needs
+only requests on top and is imported as a submodule.
+"""
+import importlib
+
+from .factparse import select_facts
+from .factstore import (
+    FACT_STORE,
+    company_facts,
+    company_info,
+    ingest_archive,
+    open_store,
+    ticker_map,
+)
+
+_LAZY = {
+    "FactIndex": "factindex",
+}
+
+__all__ = [
+    "FACT_STORE", "company_facts", "company_info", "ingest_archive", "open_store", "select_facts", "ticker_map",
+    *_LAZY,
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
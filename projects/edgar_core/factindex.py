@@ -0,0 +1,97 @@
+"""
+Columnar index over one company's XBRL facts.
+
+A companyfacts payload nests every reported value under concept -> unit ->
+rows of dicts, so each lookup used to walk and filter the JSON. FactIndex
+flattens it once into parallel columns (unit, form, fp, end, val) grouped by
+concept, with a concept -> row-range map; a lookup is a dict hit, a slice
+and a vectorized mask.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .factstore import ANNUAL_UNITS
+
+
+class FactIndex:
+    """Flat columns for one taxonomy of a companyfacts payload; build with from_facts()."""
+
+    __slots__ = ("concepts", "offsets", "units", "forms", "fps", "unit", "form", "fp", "end", "val")
+
+    def __init__(self, concepts: dict, offsets: np.ndarray, units: list, forms: list, fps: list,
+                 unit: np.ndarray, form: np.ndarray, fp: np.ndarray, end: np.ndarray, val: np.ndarray):
+        self.concepts = concepts          # concept -> position in offsets
+        self.offsets = offsets            # rows of concept i are offsets[i]:offsets[i + 1]
+        self.units, self.forms, self.fps = units, forms, fps
+        self.unit, self.form, self.fp = unit, form, fp   # int codes into the lists above; -1 = missing
+        self.end = end                    # "YYYY-MM-DD" as bytes
+        self.val = val
+
+    @classmethod
+    def from_facts(cls, facts: Optional[dict], taxonomy: str = "us-gaap") -> "FactIndex":
+        """One pass over the payload's rows; an empty index for None or a missing taxonomy."""
+        tax = ((facts or {}).get("facts") or {}).get(taxonomy) or {}
+        concepts, offsets, runs = {}, [0], []
+        form, fp, end, val = [], [], [], []
+        for concept, body in tax.items():
+            for unit, rows in (body.get("units") or {}).items():
+                runs.append((unit, len(rows)))
+                form += [d.get("form") for d in rows]
+                fp += [d.get("fp") for d in rows]
+                end += [d.get("end") or "" for d in rows]
+                val += [d.get("val") for d in rows]
+            concepts[concept] = len(concepts)
+            offsets.append(len(end))
+
+        unit_codes, units = pd.factorize(np.array([u for u, _ in runs], dtype=object))
+        form_codes, forms = pd.factorize(np.array(form, dtype=object))
+        fp_codes, fps = pd.factorize(np.array(fp, dtype=object))
+        return cls(
+            concepts, np.array(offsets, dtype=np.int64), list(units), list(forms), list(fps),
+            np.repeat(unit_codes.astype(np.int16), [n for _, n in runs]),
+            form_codes.astype(np.int16), fp_codes.astype(np.int16),
+            np.array(end, dtype="S10"), np.array(val, dtype=float),
+        )
+
+    def __len__(self):
+        return len(self.val)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, c).nbytes for c in ("offsets", "unit", "form", "fp", "end", "val"))
+
+    def _code(self, labels: list, label: str) -> int:
+        return labels.index(label) if label in labels else -2
+
+    def rows(self, concept: str, unit: Optional[str] = None, form: Optional[str] = None,
+             fp: Optional[str] = None) -> np.ndarray:
+        """Row numbers of concept, optionally filtered by unit, form and fp."""
+        i = self.concepts.get(concept)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        mask = np.ones(hi - lo, dtype=bool)
+        for col, labels, want in ((self.unit, self.units, unit), (self.form, self.forms, form),
+                                  (self.fp, self.fps, fp)):
+            if want is not None:
+                mask &= col[lo:hi] == self._code(labels, want)
+        return lo + np.flatnonzero(mask)
+
+    def annual_series(self, concept: str) -> list:
+        """
+        [(fiscal_year_end, value)] from FY 10-K rows in the first of
+        ANNUAL_UNITS that has any, one per year (the last reported wins),
+        oldest first.
+        """
+        for unit in ANNUAL_UNITS:
+            idx = self.rows(concept, unit, "10-K", "FY")
+            if not len(idx):
+                continue
+            # Last row per year: first occurrence in the reversed rows
+            idx = idx[::-1]
+            _, first = np.unique(self.end[idx].astype("S4"), return_index=True)
+            keep = idx[first]
+            return [(e.decode(), v) for e, v in zip(self.end[keep], self.val[keep].tolist())]
+        return []
@@ -0,0 +1,123 @@
+"""
+Selective streaming parser for companyfacts payloads.
+
+Large filers' companyfacts run to tens of MB and json.loads builds the
+whole object tree (several times the payload size) when a page reads a
+couple of dozen concepts. select_facts() scans the byte stream chunk by
+chunk for concept boundaries and decodes only the requested concepts, so
+memory is bounded by the largest wanted concept rather than the payload.
+
+Every concept object in companyfacts opens with its "label" key, so a
+concept starts at `"Name": {"label"` (and a taxonomy at
+`"tax": {"Name": {"label"`). An unescaped quote cannot occur inside a JSON
+string, so these patterns only match real keys.
+"""
+import json
+import re
+from typing import Iterable, Optional
+
+# A concept object's opening brace
+_OPEN = re.compile(rb'\{\s*"label"\s*:')
+# The key (and taxonomy key, for a taxonomy's first concept) before it,
+# matched against the bytes that end at the brace
+_KEY = re.compile(rb'[{,]\s*(?:"([a-z][a-z0-9-]*)"\s*:\s*\{\s*)?"([^"\\]+)"\s*:\s*$')
+_CIK = re.compile(rb'"cik"\s*:\s*(\d+)')
+_NAME = re.compile(rb'"entityName"\s*:\s*("(?:[^"\\]|\\.)*")')
+# The entity fields precede this key; like the concept keys it can't occur
+# inside a string
+_FACTS = re.compile(rb'"facts"\s*:')
+# Give up looking for the "facts" key (and the entity fields) after this much
+_HEAD_MAX = 1 << 16
+# Longest key + taxonomy prefix looked back over; also how much of an
+# unmatched buffer is kept for patterns straddling chunks
+_LOOKBACK = 512
+
+_decoder = json.JSONDecoder()
+
+
+def select_facts(chunks: Iterable[bytes], concepts, taxonomy: str = "us-gaap") -> Optional[dict]:
+    """
+    {"cik", "entityName", "facts": {taxonomy: {concept: ...}}} holding only
+    the requested concepts of one taxonomy, parsed from an iterable of byte
+    chunks (e.g. requests' iter_content). None if the stream holds no
+    concept objects at all.
+    """
+    wanted = {c.encode() for c in concepts}
+    tax_bytes = taxonomy.encode()
+    out, head = {}, {}
+    buf = b""
+    prefix = b""        # payload start, kept until the "facts" key is seen
+    scan = 0            # buf offset scanned up to
+    current = None      # taxonomy of the concept being read
+    pending = None      # (concept, buf offset of its brace) while a wanted concept is open
+    seen_any = False
+
+    def close(end: int):
+        # Decode the open concept from its brace; end is where the next key starts
+        name, start = pending
+        body, _ = _decoder.raw_decode(buf[start:end].decode())
+        out[name.decode()] = body
+
+    def feed(final: bool):
+        nonlocal buf, scan, current, pending, seen_any
+        limit = len(buf) if final else max(len(buf) - _LOOKBACK, 0)
+        for m in _OPEN.finditer(buf, scan):
+            brace = m.start()
+            if brace >= limit:
+                break
+            key = _KEY.search(buf, max(brace - _LOOKBACK, 0), brace)
+            scan = m.end()
+            if key is None:
+                continue
+            seen_any = True
+            if pending is not None:
+                close(key.start())
+                pending = None
+            if key.group(1):
+                current = key.group(1)
+            if current == tax_bytes and key.group(2) in wanted:
+                pending = (key.group(2), brace)
+        if final:
+            if pending is not None:
+                close(len(buf))
+            return
+        # Keep only what a later match can need: the open wanted concept, or
+        # the lookback before the earliest brace not yet matched
+        keep = pending[1] if pending is not None else max(max(scan, limit) - _LOOKBACK, 0)
+        if keep:
+            buf = buf[keep:]
+            scan = max(scan - keep, 0)
+            if pending is not None:
+                pending = (pending[0], 0)
+
+    def read_head(end: int):
+        for field, rx in (("cik", _CIK), ("entityName", _NAME)):
+            m = rx.search(prefix, 0, end)
+            if m:
+                head[field] = json.loads(m.group(1))
+
+    for chunk in chunks:
+        if prefix is not None:
+            # Chunks can be smaller than the entity fields, so they are read
+            # from the whole prefix once it reaches "facts"
+            prefix += chunk
+            m = _FACTS.search(prefix)
+            if m or len(prefix) > _HEAD_MAX:
+                read_head(m.start() if m else len(prefix))
+                prefix = None
+        buf += chunk
+        feed(final=False)
+    if prefix is not None:
+        read_head(len(prefix))
+    feed(final=True)
+
+    if not seen_any:
+        return None
+    return {**head, "facts": {taxonomy: out}}
+
+
+def select_facts_bytes(data: bytes, concepts, taxonomy: str = "us-gaap", chunk_size: int = 1 << 20):
+    """select_facts over an in-memory payload, fed in chunk_size slices."""
+    view = memoryview(data)
+    return select_facts((bytes(view[i:i + chunk_size]) for i in range(0, len(data), chunk_size)),
+                        concepts, taxonomy)
@@ -0,0 +1,283 @@
+"""
+Local EDGAR fact store built from the SEC bulk archives.
+
+The SEC publishes every company's companyfacts and submissions JSON as two
+nightly zip archives. ingest_archive() loads them into SQLite keyed by CIK,
+so a peer comparison reads each company in milliseconds instead of making
+two rate-limited HTTP calls per ticker. Only what the peer analysis uses is
+kept:
+
+- companies: name, tickers, SIC, fiscal year end and state.
+- filings: the most recent RECENT_FILINGS filings per company.
+- annual: annual 10-K values per (cik, concept, unit, fiscal year), deduped
+  the way extract_annual_series does.
+
+Re-ingesting is incremental. Each zip member's CRC is recorded, and only
+members whose CRC changed since the last run are parsed again.
+
+    python -m edgar_core.factstore --download ~/sec-bulk
+    python -m edgar_core.factstore --companyfacts companyfacts.zip --submissions submissions.zip
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+FACT_STORE = Path(os.environ.get("EDGAR_FACT_STORE", Path.home() / ".cache" / "edgar-peer-lens" / "facts.sqlite"))
+
+# Bulk archive paths on www.sec.gov
+BULK_PATHS = {
+    "companyfacts": "/Archives/edgar/daily-index/xbrl/companyfacts.zip",
+    "submissions": "/Archives/edgar/daily-index/bulkdata/submissions.zip",
+}
+# Units extract_annual_series looks at, in preference order
+ANNUAL_UNITS = ("USD", "shares")
+RECENT_FILINGS = 40
+# Archive members parsed per transaction
+INGEST_COMMIT_EVERY = 250
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    cik             INTEGER PRIMARY KEY,
+    name            TEXT,
+    sic             TEXT,
+    sic_desc        TEXT,
+    fiscal_year_end TEXT,
+    state           TEXT
+);
+CREATE TABLE IF NOT EXISTS tickers (
+    ticker TEXT PRIMARY KEY,
+    cik    INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS filings (
+    cik         INTEGER NOT NULL,
+    seq         INTEGER NOT NULL,
+    accn        TEXT,
+    form        TEXT,
+    filed       TEXT,
+    primary_doc TEXT,
+    PRIMARY KEY (cik, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS annual (
+    cik     INTEGER NOT NULL,
+    concept TEXT NOT NULL,
+    unit    TEXT NOT NULL,
+    year    TEXT NOT NULL,
+    end     TEXT NOT NULL,
+    val     NUMERIC,
+    PRIMARY KEY (cik, concept, unit, year)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS members (
+    archive TEXT NOT NULL,
+    member  TEXT NOT NULL,
+    crc     INTEGER NOT NULL,
+    PRIMARY KEY (archive, member)
+) WITHOUT ROWID;
+"""
+
+
+def open_store(path=None, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Connection to the fact store. readonly connections can be shared across
+    threads (the Streamlit app keeps one per process).
+    """
+    path = Path(path or FACT_STORE)
+    if readonly:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(_SCHEMA)
+    return con
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+def _cik(member: str) -> Optional[int]:
+    """CIK of a CIK##########.json member; None for anything else (e.g. submissions page files)."""
+    stem = Path(member).stem
+    if not (stem.startswith("CIK") and stem[3:].isdigit()):
+        return None
+    return int(stem[3:])
+
+
+def annual_rows(cik: int, facts: dict) -> list:
+    """
+    (cik, concept, unit, year, end, val) for every us-gaap FY 10-K value in a
+    companyfacts payload, one per fiscal year (the last reported wins, as in
+    extract_annual_series).
+    """
+    rows = []
+    for concept, body in ((facts.get("facts") or {}).get("us-gaap") or {}).items():
+        units = body.get("units") or {}
+        for unit in ANNUAL_UNITS:
+            seen = {}
+            for d in units.get(unit) or ():
+                if d.get("form") == "10-K" and d.get("fp") == "FY":
+                    seen[d["end"][:4]] = (d["end"], d["val"])
+            rows.extend((cik, concept, unit, year, end, val) for year, (end, val) in seen.items())
+    return rows
+
+
+def _company_rows(cik: int, sub: dict):
+    company = (cik, sub.get("name"), sub.get("sic"), sub.get("sicDescription"),
+               sub.get("fiscalYearEnd"), sub.get("stateOfIncorporation"))
+    tickers = [(t.upper(), cik) for t in sub.get("tickers") or () if t]
+    recent = (sub.get("filings") or {}).get("recent") or {}
+    cols = [recent.get(k) or [] for k in ("accessionNumber", "form", "filingDate", "primaryDocument")]
+    filings = [(cik, i, *vals) for i, vals in enumerate(zip(*cols)) if i < RECENT_FILINGS]
+    return company, tickers, filings
+
+
+def _store_companyfacts(con: sqlite3.Connection, cik: int, payload: dict):
+    con.execute("DELETE FROM annual WHERE cik = ?", (cik,))
+    con.executemany("INSERT INTO annual VALUES (?, ?, ?, ?, ?, ?)", annual_rows(cik, payload))
+
+
+def _store_submissions(con: sqlite3.Connection, cik: int, payload: dict):
+    company, tickers, filings = _company_rows(cik, payload)
+    con.execute("INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, ?)", company)
+    con.execute("DELETE FROM tickers WHERE cik = ?", (cik,))
+    con.executemany("INSERT OR REPLACE INTO tickers VALUES (?, ?)", tickers)
+    con.execute("DELETE FROM filings WHERE cik = ?", (cik,))
+    con.executemany("INSERT INTO filings VALUES (?, ?, ?, ?, ?, ?)", filings)
+
+
+_STORERS = {"companyfacts": _store_companyfacts, "submissions": _store_submissions}
+
+
+# ── Ingest ────────────────────────────────────────────────────────────────────
+def ingest_archive(con: sqlite3.Connection, kind: str, path, progress=None) -> dict:
+    """
+    Load a companyfacts or submissions zip into the store. Members whose CRC
+    matches the last ingest are skipped, and a changed company's rows are
+    replaced. progress(done, total) is called every INGEST_COMMIT_EVERY
+    members. Returns counts of members seen, parsed and unreadable.
+    """
+    store = _STORERS[kind]
+    known = dict(con.execute("SELECT member, crc FROM members WHERE archive = ?", (kind,)))
+    stats = {"members": 0, "parsed": 0, "failed": 0}
+    with zipfile.ZipFile(path) as zf:
+        infos = [i for i in zf.infolist() if _cik(i.filename) is not None]
+        stats["members"] = len(infos)
+        todo = [i for i in infos if known.get(i.filename) != i.CRC]
+        for start in range(0, len(todo), INGEST_COMMIT_EVERY):
+            with con:
+                for info in todo[start:start + INGEST_COMMIT_EVERY]:
+                    try:
+                        payload = json.loads(zf.read(info))
+                    except (ValueError, zipfile.BadZipFile):
+                        stats["failed"] += 1
+                        continue
+                    store(con, _cik(info.filename), payload)
+                    con.execute("INSERT OR REPLACE INTO members VALUES (?, ?, ?)", (kind, info.filename, info.CRC))
+                    stats["parsed"] += 1
+            if progress:
+                progress(min(start + INGEST_COMMIT_EVERY, len(todo)), len(todo))
+    return stats
+
+
+def download_archive(kind: str, dest_dir) -> Path:
+    """Stream one bulk archive from the SEC to dest_dir; returns its path."""
+    from . import sec  # deferred: only the download needs requests
+
+    dest = Path(dest_dir) / f"{kind}.zip"
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_suffix(".part")
+    with sec.get(sec.url("www", BULK_PATHS[kind]), stream=True, timeout=60) as r:
+        r.raise_for_status()
+        with open(tmp, "wb") as f:
+            for chunk in r.iter_content(1 << 20):
+                f.write(chunk)
+    os.replace(tmp, dest)
+    return dest
+
+
+# ── Queries ───────────────────────────────────────────────────────────────────
+def _ingested(con: sqlite3.Connection, kind: str, cik) -> bool:
+    """True if the CIK's member of the kind archive has been ingested (bulk members are CIK##########.json)."""
+    return con.execute("SELECT 1 FROM members WHERE archive = ? AND member = ?",
+                       (kind, f"CIK{int(cik):010d}.json")).fetchone() is not None
+
+
+def ticker_map(con: sqlite3.Connection) -> dict:
+    """{ticker: {"cik": zero-padded CIK, "name"}}, shaped like the app's load_ticker_map."""
+    q = "SELECT t.ticker, t.cik, c.name FROM tickers t JOIN companies c USING (cik)"
+    return {t: {"cik": str(cik).zfill(10), "name": name} for t, cik, name in con.execute(q)}
+
+
+def company_info(con: sqlite3.Connection, cik) -> Optional[dict]:
+    """The submissions fields the app reads, shaped like the SEC payload; None if not stored."""
+    row = con.execute("SELECT name, sic, sic_desc, fiscal_year_end, state FROM companies WHERE cik = ?",
+                      (int(cik),)).fetchone()
+    if row is None:
+        return None
+    filings = con.execute("SELECT accn, form, filed, primary_doc FROM filings WHERE cik = ? ORDER BY seq",
+                          (int(cik),)).fetchall()
+    accn, form, filed, doc = (list(c) for c in zip(*filings)) if filings else ([], [], [], [])
+    return {
+        "cik": str(cik).zfill(10), "name": row[0], "sic": row[1], "sicDescription": row[2],
+        "fiscalYearEnd": row[3], "stateOfIncorporation": row[4],
+        "filings": {"recent": {"accessionNumber": accn, "form": form, "filingDate": filed,
+                               "primaryDocument": doc}},
+    }
+
+
+def company_facts(con: sqlite3.Connection, cik, concepts=None) -> Optional[dict]:
+    """
+    A companyfacts-shaped payload holding only the stored annual 10-K values
+    (optionally just the given concepts), so extract_annual_series reads it
+    unchanged. A company that was ingested without any of those values gets
+    an empty us-gaap; None only if its companyfacts were never ingested.
+    """
+    q = "SELECT concept, unit, end, val FROM annual WHERE cik = ?"
+    args = [int(cik)]
+    if concepts:
+        concepts = list(concepts)
+        q += f" AND concept IN ({','.join('?' * len(concepts))})"
+        args += concepts
+    us_gaap = {}
+    # Key order (concept, unit, year) is also end order within a series
+    for concept, unit, end, val in con.execute(q + " ORDER BY concept, unit, year", args):
+        units = us_gaap.setdefault(concept, {"units": {}})["units"]
+        units.setdefault(unit, []).append({"end": end, "val": val, "form": "10-K", "fp": "FY"})
+    if not us_gaap and not _ingested(con, "companyfacts", cik):
+        return None
+    return {"cik": int(cik), "facts": {"us-gaap": us_gaap}}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--companyfacts", help="local companyfacts.zip")
+    ap.add_argument("--submissions", help="local submissions.zip")
+    ap.add_argument("--download", metavar="DIR", help="fetch both archives from the SEC into DIR first")
+    ap.add_argument("--store", default=None, help=f"SQLite file (default {FACT_STORE})")
+    args = ap.parse_args(argv)
+
+    archives = {"companyfacts": args.companyfacts, "submissions": args.submissions}
+    if args.download:
+        archives = {kind: download_archive(kind, args.download) for kind in BULK_PATHS}
+    if not any(archives.values()):
+        ap.error("give --companyfacts/--submissions archives or --download DIR")
+
+    con = open_store(args.store)
+    try:
+        for kind, path in archives.items():
+            if not path:
+                continue
+            t0 = time.perf_counter()
+            stats = ingest_archive(con, kind, path,
+                                   progress=lambda d, n: print(f"\r{kind}: {d}/{n}", end="", file=sys.stderr))
+            print(f"\r{kind}: {stats['parsed']} of {stats['members']} members changed, "
+                  f"{stats['failed']} unreadable, {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Shared SEC EDGAR HTTP client.
+
+Every SEC request in the edgar-app goes through get(), which adds:
+
+- one pooled requests.Session per process, so connections (and TLS) are
+  reused instead of handshaking per call;
+- a token bucket shared by all threads that holds the process to SEC's
+  fair-access limit of SEC_RATE (10) requests per second;
+- retries with exponential backoff on 429/5xx and connection errors,
+  honouring Retry-After;
+- conditional GETs. Bodies served with an ETag or Last-Modified are kept
+  (up to SEC_CACHE_BYTES, least recently used first out) and revalidated
+  with If-None-Match / If-Modified-Since. A 304 is replayed as the cached
+  200 without transferring the body again. Streamed responses are not kept.
+
+The hosts come from SEC_WWW, SEC_DATA and SEC_EFTS, so the client and the
+app can run against a local mock server.
+"""
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from shared_core import TokenBucket
+
+SEC_USER_AGENT = os.environ.get("SEC_USER_AGENT", "Justin Louie edgar-peer-lens@gmail.com")
+SEC_RATE = float(os.environ.get("SEC_RATE", 10))   # requests per second, across all threads
+SEC_CACHE_BYTES = 64 << 20
+HOSTS = {
+    "www": os.environ.get("SEC_WWW", "https://www.sec.gov"),
+    "data": os.environ.get("SEC_DATA", "https://data.sec.gov"),
+    "efts": os.environ.get("SEC_EFTS", "https://efts.sec.gov"),
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Longest Retry-After honoured before giving up on the wait and backing off normally
+MAX_RETRY_AFTER = 30.0
+
+
+def url(host: str, path: str) -> str:
+    """Absolute URL for a path on one of the SEC hosts ("www", "data", "efts")."""
+    return HOSTS[host] + path
+
+
+class SECClient:
+    """Rate-limited, retrying, revalidating GETs over one pooled session."""
+
+    def __init__(self, rate: float = SEC_RATE, user_agent: str = SEC_USER_AGENT, retries: int = 4,
+                 backoff: float = 0.5, timeout: float = 15, pool_size: int = 16,
+                 cache_bytes: int = SEC_CACHE_BYTES):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(HOSTS), pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = user_agent
+        # burst=1: requests are spaced evenly rather than let through in bursts
+        self.limiter = TokenBucket(rate, burst=1)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()   # url -> (validators, status, headers, encoding, body)
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0}
+
+    # ── Conditional GET cache ──────────────────────────────────────────────────
+    def _validators(self, key: str) -> dict:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return {}
+            self._cache.move_to_end(key)
+            return entry[0]
+
+    def _remember(self, key: str, r: requests.Response):
+        validators = {}
+        if r.headers.get("ETag"):
+            validators["If-None-Match"] = r.headers["ETag"]
+        if r.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = r.headers["Last-Modified"]
+        size = len(r.content)
+        if not validators or size > self.cache_bytes // 4:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._cached_bytes -= len(old[4])
+            self._cache[key] = (validators, r.status_code, dict(r.headers), r.encoding, r.content)
+            self._cached_bytes += size
+            while self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted[4])
+
+    def _replay(self, key: str, r: requests.Response) -> Optional[requests.Response]:
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is None:
+            return None
+        _, status, headers, encoding, body = entry
+        replay = requests.Response()
+        replay.status_code = status
+        replay.headers = CaseInsensitiveDict(headers)
+        replay.encoding = encoding
+        replay._content = body
+        replay.url = r.url
+        replay.request = r.request
+        return replay
+
+    # ── Requests ──────────────────────────────────────────────────────────────
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _wait(self, attempt: int, r: Optional[requests.Response]) -> float:
+        retry_after = r.headers.get("Retry-After") if r is not None else None
+        if retry_after and retry_after.isdigit() and float(retry_after) <= MAX_RETRY_AFTER:
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * (1 + random.random() / 2)
+
+    def get(self, url: str, params: Optional[dict] = None, stream: bool = False,
+            timeout: Optional[float] = None) -> requests.Response:
+        """
+        GET url. Non-retryable statuses are returned as is; after the last
+        retry the final 429/5xx response is returned or the connection
+        error raised. stream=True responses skip the conditional cache.
+        """
+        key = requests.Request("GET", url, params=params).prepare().url
+        headers = {} if stream else self._validators(key)
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            self._count("requests")
+            try:
+                r = self.session.get(url, params=params, headers=headers, stream=stream,
+                                     timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                r = None
+            if r is not None and r.status_code not in RETRY_STATUS:
+                break
+            if attempt == self.retries:
+                break
+            self._count("retries")
+            if r is not None:
+                r.close()
+            time.sleep(self._wait(attempt, r))
+
+        if r.status_code == 304 and headers:
+            replay = self._replay(key, r)
+            if replay is None:
+                # Evicted since the validators were read: fetch unconditionally
+                return self.get(url, params, stream, timeout)
+            self._count("not_modified")
+            return replay
+        if not stream and r.status_code == 200:
+            self._remember(key, r)
+        return r
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client() -> SECClient:
+    """The process-wide SECClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SECClient()
+        return _client
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """client().get(url, ...)."""
+    return client().get(url, **kwargs)
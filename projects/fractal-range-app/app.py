@@ -1,12 +1,23 @@
 import streamlit as st
-import yfinance as yf
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import time
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fractal_core import (
+    BARS_PER_DAY, CHART_MAX_POINTS, H_CLIP, RS_LOG_POINTS, SIGNALS, TIMEFRAMES, TokenBucket, backtest_bands,
+    bucket_starts, classify_regime, compute_range_pair, downsample_bars, hurst_rs, load_bars, load_history,
+    lttb_indices, rolling_band_h, screen, signal_codes, signal_followthrough, signal_transitions, slice_period,
+)
+
 st.set_page_config(
     page_title="Fractal Range — Trade · Trend · Tail",
     page_icon="▣",
@@ -221,102 +232,93 @@ _AXIS = dict(
 )
 
 
-# ── Hurst R/S ────────────────────────────────────────────────────────────────
-def _rs_core(prices: np.ndarray, min_chunk: int = 20):
-    log_ret = np.diff(np.log(np.maximum(prices, 1e-12)))
-    n = len(log_ret)
-    sizes = sorted(set(n // k for k in range(2, n + 1) if n // k >= min_chunk))
-    if len(sizes) < 3:
-        return [], []
-    ns, rs_means = [], []
-    for size in sizes:
-        rs_list = []
-        for start in range(0, n - size + 1, size):
-            chunk = log_ret[start : start + size]
-            dev = np.cumsum(chunk - chunk.mean())
-            R = dev.max() - dev.min()
-            S = chunk.std(ddof=1)
-            if S > 0:
-                rs_list.append(R / S)
-        if rs_list:
-            ns.append(size)
-            rs_means.append(float(np.mean(rs_list)))
-    return ns, rs_means
-
-
-def hurst_rs(prices: np.ndarray) -> Optional[float]:
-    ns, rs = _rs_core(prices)
-    if len(ns) < 3:
-        return None
-    H = np.polyfit(np.log(ns), np.log(rs), 1)[0]
-    return round(float(np.clip(H, 0.01, 0.99)), 4)
-
-
-# ── Fractal range computation ─────────────────────────────────────────────────
-TIMEFRAMES = {
-    "trade": {"window": 21,  "label": "Trade",  "desc": "3 weeks",   "color": "#F0A500"},
-    "trend": {"window": 63,  "label": "Trend",  "desc": "3 months",  "color": "#5B9BD5"},
-    "tail":  {"window": 252, "label": "Tail",   "desc": "12 months", "color": "#9B7FE8"},
-}
-
-
-def compute_ranges(df: pd.DataFrame, H: float, use_hurst: bool = True) -> pd.DataFrame:
-    """
-    Compute fractal-adjusted Trade/Trend/Tail support & resistance.
+# ── Fractal analytics ─────────────────────────────────────────────────────────
+# Exponent source: one full-period H, or a trailing-window H per bar
+H_MODES = {"Full period": None, "Rolling 1y": 252, "Rolling 2y": 504}
 
-    Band width = hvol(N) * close * (N/252)^exponent
-    where exponent = H (fractal) or 0.5 (classical).
-    """
-    close = df["Close"]
-    log_ret = np.log(close / close.shift(1))
-    exponent = H if use_hurst else 0.5
-
-    out = {}
-    for name, cfg in TIMEFRAMES.items():
-        N = cfg["window"]
-        hvol = log_ret.rolling(N).std() * np.sqrt(252)
-        ma   = close.rolling(N).mean()
-        sigma = hvol * close * (N / 252) ** exponent
+SIGNAL_STYLES = {
+    "NO DATA":           ("#1A1F2A",               "#6B7A8F"),
+    "BULLISH BREAKOUT":  ("rgba(0,200,150,0.15)",  "#00C896"),
+    "BULLISH":           ("rgba(0,200,150,0.10)",  "#00C896"),
+    "BEARISH":           ("rgba(224,69,96,0.10)",  "#E04560"),
+    "BEARISH BREAKDOWN": ("rgba(224,69,96,0.15)",  "#E04560"),
+}
 
-        out[f"{name}_upper"] = ma + sigma
-        out[f"{name}_lower"] = ma - sigma
-        out[f"{name}_ma"]    = ma
+# Timeline fill per signal code (index into SIGNALS)
+SIGNAL_TIMELINE_COLORS = ["#1A1F2A", "#E04560", "rgba(224,69,96,0.45)", "rgba(0,200,150,0.45)", "#00C896"]
 
-    return pd.DataFrame(out, index=df.index)
+# Trading days a longer horizon has to confirm a shorter horizon's breakout/breakdown
+FOLLOW_DAYS = 21
 
+# Screener universe cap and store top-up concurrency (yfinance requests per second)
+SCREEN_MAX_TICKERS = 3000
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", 8))
+SCREEN_WORKERS = int(os.environ.get("SCREEN_WORKERS", os.cpu_count() or 1))
+FETCH_RATE = float(os.environ.get("FETCH_RATE", 5))
 
-def get_signal(close_val: float, upper: float, lower: float, ma: float):
-    """Returns (label, bg_color, text_color)."""
-    if pd.isna(upper) or pd.isna(lower):
-        return "NO DATA", "#1A1F2A", "#6B7A8F"
-    if close_val >= upper:
-        return "BULLISH BREAKOUT", "rgba(0,200,150,0.15)", "#00C896"
-    if close_val > ma:
-        return "BULLISH", "rgba(0,200,150,0.10)", "#00C896"
-    if close_val > lower:
-        return "BEARISH", "rgba(224,69,96,0.10)", "#E04560"
-    return "BEARISH BREAKDOWN", "rgba(224,69,96,0.15)", "#E04560"
+REGIME_COLORS = {
+    "Mean-Reverting": "#E04560",
+    "Random Walk":    "#6B7A8F",
+    "Persistent":     "#00C896",
+}
 
 
 def h_regime(H: float):
-    if H < 0.45:
-        return "Mean-Reverting", "#E04560"
-    if H < 0.55:
-        return "Random Walk",    "#6B7A8F"
-    return "Persistent",         "#00C896"
+    label = classify_regime(H)
+    return label, REGIME_COLORS[label]
 
 
 # ── Cached data ───────────────────────────────────────────────────────────────
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_ohlcv(ticker: str, period: str) -> pd.DataFrame:
-    df = yf.Ticker(ticker).history(period=period)
-    return df[["Open", "High", "Low", "Close", "Volume"]].dropna()
+    return slice_period(load_history(ticker), period)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_bars(ticker: str, interval: str, period: str) -> pd.DataFrame:
+    """Intraday bars from the memory-mapped bar store, topped up from yfinance."""
+    return slice_period(load_bars(ticker, interval, fetch_limiter()), period)
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def get_hurst(ticker: str, period: str) -> Optional[float]:
     df = fetch_ohlcv(ticker, period)
-    return hurst_rs(df["Close"].values)
+    return hurst_rs(df["Close"].values, clip=H_CLIP)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_rolling_h(ticker: str, window: int, asof: pd.Timestamp) -> pd.Series:
+    """
+    Point-in-time H for every bar of the full stored history, so a date's
+    exponent doesn't depend on the selected period. asof, the last bar of the
+    caller's price frame, keys the cache: when that frame advances the series
+    is recomputed, rather than a stale one leaving the newest bar without H.
+    """
+    hist = load_history(ticker)
+    return pd.Series(rolling_band_h(hist["Close"].values, window), index=hist.index)
+
+
+@st.cache_resource
+def fetch_limiter() -> TokenBucket:
+    """One limiter per server process, shared by every session and worker thread."""
+    return TokenBucket(FETCH_RATE)
+
+
+@st.cache_resource
+def screen_pool() -> ProcessPoolExecutor:
+    """
+    One screener worker pool per server process, shared by every session, so
+    a screen doesn't start and tear down worker processes on each run. Workers
+    are spawned: forking the threaded Streamlit server can deadlock them.
+    """
+    return ProcessPoolExecutor(max_workers=SCREEN_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _top_up(ticker: str) -> bool:
+    try:
+        return not load_history(ticker, fetch_limiter()).empty
+    except Exception:
+        return False
 
 
 # ── Header ────────────────────────────────────────────────────────────────────
@@ -336,15 +338,83 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+mode = st.radio("Mode", ["Single ticker", "Screener"], horizontal=True, label_visibility="collapsed")
+
+# ── Screener ──────────────────────────────────────────────────────────────────
+if mode == "Screener":
+    universe_raw = st.text_area("Universe", value="SPY, QQQ, IWM, DIA, AAPL, MSFT, NVDA, AMZN, GOOGL, META",
+                                height=90, help="Comma, space or newline separated. Hundreds to thousands of symbols.")
+    s1, s2, s3, s4 = st.columns([0.9, 0.9, 1.2, 0.9])
+    with s1:
+        scr_period = st.selectbox("Calculation Period", ["2y", "5y", "10y", "max"], index=1, key="scr_period")
+    with s2:
+        scr_h_mode = st.selectbox("H Estimate", list(H_MODES), index=0, key="scr_h_mode")
+    with s3:
+        top_up = st.toggle("Top up price store first", value=True,
+                           help="Fetch new bars for stale or missing tickers. Off = screen the store as-is.")
+    with s4:
+        st.markdown("<div style='height:1.85rem'></div>", unsafe_allow_html=True)
+        scan = st.button("Screen", type="primary", use_container_width=True)
+
+    if scan:
+        universe = list(dict.fromkeys(
+            t.strip().upper() for t in universe_raw.replace("\n", ",").replace(" ", ",").split(",") if t.strip()
+        ))[:SCREEN_MAX_TICKERS]
+
+        if top_up:
+            prog = st.progress(0, text="Updating price store...")
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+                for i, _ in enumerate(pool.map(_top_up, universe)):
+                    prog.progress((i + 1) / len(universe), text=f"Updated {i + 1}/{len(universe)}")
+            prog.empty()
+
+        prog = st.progress(0, text="Screening...")
+
+        def _screen(pool):
+            return screen(universe, scr_period, H_MODES[scr_h_mode], pool=pool,
+                          progress=lambda done, total: prog.progress(done / total, text=f"Screened {done}/{total}"))
+
+        try:
+            table = _screen(screen_pool())
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool once
+            screen_pool.clear()
+            table = _screen(screen_pool())
+        prog.empty()
+
+        if table.attrs["skipped"]:
+            st.warning(f"Not in the store or too short: {', '.join(table.attrs['skipped'][:50])}"
+                       + (" …" if len(table.attrs["skipped"]) > 50 else ""))
+        if table.empty:
+            st.error("Nothing to screen. Check your tickers or top up the price store.")
+            st.stop()
+
+        st.markdown(f'<div class="section-label">Fractal Range Screener — {len(table)} tickers · {scr_period}</div>',
+                    unsafe_allow_html=True)
+        st.dataframe(
+            table,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Close": st.column_config.NumberColumn(format="$%.2f"),
+                "H": st.column_config.NumberColumn(format="%.3f"),
+                **{col: st.column_config.NumberColumn(format="%.2f%%") for col in table.columns if col.endswith("%")},
+            },
+        )
+    st.stop()
+
 # ── Inputs ────────────────────────────────────────────────────────────────────
-c1, c2, c3, c4, c5 = st.columns([1.2, 0.9, 0.9, 0.9, 0.9])
+c1, c2, c3, c6, c4, c5 = st.columns([1.2, 0.9, 0.9, 0.9, 0.9, 0.9])
 with c1:
     ticker = st.text_input("Ticker", value="SPY", placeholder="SPY, AAPL, BTC-USD, RY.TO").strip().upper()
 with c2:
     period = st.selectbox("Calculation Period", ["2y", "5y", "10y", "max"], index=1)
 with c3:
-    display_days = st.selectbox("Chart Window", [60, 90, 180, 365], index=1,
-                                format_func=lambda x: f"Last {x} days")
+    display_days = st.selectbox("Chart Window", [60, 90, 180, 365, 730, 1260, 0], index=1,
+                                format_func=lambda x: f"Last {x} days" if x else "Full period")
+with c6:
+    h_mode = st.selectbox("H Estimate", list(H_MODES), index=0,
+                          help="Rolling uses only the trailing window at each bar — no look-ahead.")
 with c4:
     use_hurst = st.toggle("Fractal scaling (H)", value=True,
                           help="Use Hurst exponent to scale bands. Off = classical √T.")
@@ -352,44 +422,85 @@ with c5:
     st.markdown("<div style='height:1.85rem'></div>", unsafe_allow_html=True)
     run = st.button("Analyze", type="primary", use_container_width=True)
 
+b0, b1, b2, _ = st.columns([0.9, 0.9, 0.9, 2.7])
+with b0:
+    interval = st.selectbox("Bar Interval", list(BARS_PER_DAY), index=0,
+                            help="Intraday windows and volatility scale by bars per trading day.")
+with b1:
+    cost_bps = st.number_input("Backtest cost (bps)", min_value=0.0, max_value=100.0, value=5.0, step=1.0,
+                               help="Charged per unit of position traded.")
+with b2:
+    st.markdown("<div style='height:1.85rem'></div>", unsafe_allow_html=True)
+    long_only = st.toggle("Long only", value=False, help="Breakdowns exit to cash instead of going short.")
+
 # ── Analysis ──────────────────────────────────────────────────────────────────
 if run:
+    # Windows are in trading days; intraday bars scale them and the
+    # annualization by bars per day
+    bars_per_day = BARS_PER_DAY[interval]
+    bars_per_year = 252 * bars_per_day
+
     with st.spinner(f"Fetching {ticker}…"):
         try:
-            df = fetch_ohlcv(ticker, period)
+            df = fetch_ohlcv(ticker, period) if interval == "1d" else fetch_bars(ticker, interval, period)
         except Exception as e:
             st.error(f"Could not fetch data for {ticker}: {e}")
             st.stop()
 
-    if len(df) < 300:
-        st.warning(f"Only {len(df)} trading days available. Results may be less reliable.")
+    if len(df) < 300 * bars_per_day:
+        st.warning(f"Only {len(df):,} {interval} bars available. Results may be less reliable.")
+    for before, after in df.attrs.get("gaps", []):
+        if after >= df.index[0]:
+            st.warning(f"No {interval} bars between {before:%Y-%m-%d %H:%M} and {after:%Y-%m-%d %H:%M}: "
+                       f"the bar store fell further behind than yfinance serves.")
 
     # Hurst
+    h_window = H_MODES[h_mode]
+    if h_window is not None and interval != "1d":
+        st.info("Rolling H is available on daily bars only — intraday bands use the full-period H.")
+        h_window = None
     with st.spinner("Computing Hurst exponent…"):
-        H = hurst_rs(df["Close"].values)
-
-    if H is None:
-        H = 0.5
+        if h_window is None:
+            # The full n//k chunk grid is too dense for intraday histories
+            log_points = None if interval == "1d" else RS_LOG_POINTS
+            h_bars = hurst_rs(df["Close"].values, log_points=log_points, clip=H_CLIP)
+        else:
+            h_bars = get_rolling_h(ticker, h_window, df.index[-1]).reindex(df.index).values
+            if np.isnan(h_bars).all():
+                h_bars = None
+
+    if h_bars is None:
+        h_bars = 0.5
         st.warning("Insufficient data for R/S analysis — defaulting to H=0.5 (classical).")
 
-    effective_H = H if use_hurst else 0.5
+    effective_H = h_bars if use_hurst else 0.5
 
     # Ranges
-    ranges = compute_ranges(df, effective_H, use_hurst=True)
-    combined = pd.concat([df, ranges], axis=1).dropna()
+    # Classical (H=0.5) bands share every rolling intermediate with the fractal ones
+    ranges, ranges_classical = compute_range_pair(df, effective_H, bars_per_year)
+    combined = pd.concat([df, ranges], axis=1)
+    combined["H"] = h_bars
+    combined = combined.dropna()
+    if combined.empty:
+        st.error(f"Not enough history for {ticker} to fill the bands.")
+        st.stop()
 
     last = combined.iloc[-1]
     close_now = last["Close"]
+    # H in force at the latest bar: the full-period value or the rolling estimate
+    H = last["H"]
+    # Signal code per bar (rows) and horizon (columns, TIMEFRAMES order)
+    codes = signal_codes(combined["Close"].values, combined)
 
     # ── Signal cards + H card ─────────────────────────────────────────────────
     col_t, col_tr, col_ta, col_h = st.columns([1, 1, 1, 1])
     card_cols = {"trade": col_t, "trend": col_tr, "tail": col_ta}
 
-    for name, cfg in TIMEFRAMES.items():
+    for j, (name, cfg) in enumerate(TIMEFRAMES.items()):
         upper = last[f"{name}_upper"]
         lower = last[f"{name}_lower"]
-        ma    = last[f"{name}_ma"]
-        sig_label, sig_bg, sig_fg = get_signal(close_now, upper, lower, ma)
+        sig_label = SIGNALS[codes[-1, j]]
+        sig_bg, sig_fg = SIGNAL_STYLES[sig_label]
 
         with card_cols[name]:
             st.markdown(f"""
@@ -402,7 +513,8 @@ if run:
                 <div class="sig-levels">
                     resist&nbsp;<span>${upper:,.2f}</span><br>
                     price&nbsp;&nbsp;<span>${close_now:,.2f}</span><br>
-                    support&nbsp;<span>${lower:,.2f}</span>
+                    support&nbsp;<span>${lower:,.2f}</span><br>
+                    H&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;<span>{H:.3f}</span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -420,7 +532,7 @@ if run:
         <div class="h-strip" style="border-left-color:{regime_color};">
             <div style="font-family:'Fira Code',monospace;font-size:0.55rem;letter-spacing:0.18em;
             text-transform:uppercase;color:var(--text-muted);margin-bottom:0.3rem;">
-                Hurst Exponent{'  ·  fractal on' if use_hurst else '  ·  classical √T'}
+                Hurst Exponent · {h_mode}{'  ·  fractal on' if use_hurst else '  ·  classical √T'}
             </div>
             <div class="h-strip-val" style="color:{regime_color};">{H:.3f}</div>
             <div class="h-strip-label" style="color:{regime_color};">{regime_label}</div>
@@ -431,12 +543,26 @@ if run:
     st.markdown("<div style='height:0.5rem'></div>", unsafe_allow_html=True)
 
     # ── Chart ─────────────────────────────────────────────────────────────────
-    st.markdown(f'<div class="section-label">{ticker} — {display_days}-Day Chart with Fractal Bands</div>',
+    # Slice to display window (0 = everything in the period)
+    chart_df = combined.tail(display_days * bars_per_day) if display_days else combined
+    # Exchange wall-clock times: .values on a tz-aware index gives naive UTC,
+    # which plots daily candles at 04:00/05:00 and intraday bars hours off
+    chart_x = chart_df.index.tz_localize(None) if chart_df.index.tz is not None else chart_df.index
+    chart_x = chart_x.values
+
+    # Merge bars into at most CHART_MAX_POINTS buckets, keeping each bucket's
+    # extremes, so long windows don't ship megabytes of JSON to the browser
+    band_cols = [f"{name}_{part}" for name in TIMEFRAMES for part in ("upper", "lower", "ma")]
+    how = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum",
+           **{c: "max" if c.endswith("upper") else "min" if c.endswith("lower") else "mean" for c in band_cols}}
+    x, bars = downsample_bars(chart_x, {c: chart_df[c].values for c in how}, how)
+    bucket = len(chart_df) / len(x)
+
+    chart_title = f"{display_days}-Day" if display_days else f"{period.upper()} ({len(chart_df):,} bars)"
+    st.markdown(f'<div class="section-label">{ticker} — {chart_title} Chart with Fractal Bands'
+                f'{f" · {bucket:.1f}-bar candles" if bucket > 1 else ""}</div>',
                 unsafe_allow_html=True)
 
-    # Slice to display window
-    chart_df = combined.tail(display_days)
-
     fig = make_subplots(
         rows=2, cols=1,
         shared_xaxes=True,
@@ -450,8 +576,8 @@ if run:
         opacity = {"tail": 0.07, "trend": 0.09, "trade": 0.11}[name]
 
         fig.add_trace(go.Scatter(
-            x=list(chart_df.index) + list(chart_df.index[::-1]),
-            y=list(chart_df[f"{name}_upper"]) + list(chart_df[f"{name}_lower"][::-1]),
+            x=np.concatenate([x, x[::-1]]),
+            y=np.concatenate([bars[f"{name}_upper"], bars[f"{name}_lower"][::-1]]),
             fill="toself",
             fillcolor=f"rgba({color_rgb[0]},{color_rgb[1]},{color_rgb[2]},{opacity})",
             line=dict(width=0),
@@ -462,8 +588,8 @@ if run:
         # Upper/lower band lines
         for bound in ["upper", "lower"]:
             fig.add_trace(go.Scatter(
-                x=chart_df.index,
-                y=chart_df[f"{name}_{bound}"],
+                x=x,
+                y=bars[f"{name}_{bound}"],
                 line=dict(color=f"rgba({color_rgb[0]},{color_rgb[1]},{color_rgb[2]},0.5)",
                           width=1, dash="dot"),
                 name=f"{cfg['label']} {'R' if bound == 'upper' else 'S'}",
@@ -472,8 +598,8 @@ if run:
 
         # MA line
         fig.add_trace(go.Scatter(
-            x=chart_df.index,
-            y=chart_df[f"{name}_ma"],
+            x=x,
+            y=bars[f"{name}_ma"],
             line=dict(color=f"rgba({color_rgb[0]},{color_rgb[1]},{color_rgb[2]},0.3)",
                       width=1),
             showlegend=False,
@@ -482,11 +608,11 @@ if run:
 
     # Candlestick
     fig.add_trace(go.Candlestick(
-        x=chart_df.index,
-        open=chart_df["Open"],
-        high=chart_df["High"],
-        low=chart_df["Low"],
-        close=chart_df["Close"],
+        x=x,
+        open=bars["Open"],
+        high=bars["High"],
+        low=bars["Low"],
+        close=bars["Close"],
         increasing_line_color="#00C896",
         decreasing_line_color="#E04560",
         increasing_fillcolor="#00C896",
@@ -496,11 +622,10 @@ if run:
     ), row=1, col=1)
 
     # Volume
-    colors = ["#00C896" if c >= o else "#E04560"
-              for c, o in zip(chart_df["Close"], chart_df["Open"])]
+    colors = np.where(bars["Close"] >= bars["Open"], "#00C896", "#E04560")
     fig.add_trace(go.Bar(
-        x=chart_df.index,
-        y=chart_df["Volume"],
+        x=x,
+        y=bars["Volume"],
         marker_color=colors,
         marker_opacity=0.5,
         showlegend=False,
@@ -536,8 +661,8 @@ if run:
         st.markdown('<div class="section-label">Fractal vs Classical — Tail Band Width Difference</div>',
                     unsafe_allow_html=True)
 
-        ranges_classical = compute_ranges(df, 0.5, use_hurst=True)
-        comb_cl = pd.concat([df, ranges_classical], axis=1).dropna().tail(display_days)
+        comb_cl = pd.concat([df, ranges_classical], axis=1).dropna().tail(len(chart_df))
+        x_ns = chart_x.view("i8")
 
         fig2 = go.Figure()
         for name, cfg in TIMEFRAMES.items():
@@ -546,10 +671,11 @@ if run:
             frac_width = chart_df[f"{name}_upper"] - chart_df[f"{name}_lower"]
             clas_width = comb_cl[f"{name}_upper"]  - comb_cl[f"{name}_lower"]
             diff_pct   = ((frac_width.values - clas_width.values) / clas_width.values * 100)
+            keep       = lttb_indices(x_ns, diff_pct)
 
             fig2.add_trace(go.Scatter(
-                x=chart_df.index,
-                y=diff_pct,
+                x=chart_x[keep],
+                y=diff_pct[keep],
                 mode="lines",
                 name=f"{cfg['label']} (H={H:.2f} vs H=0.5)",
                 line=dict(color=f"rgba({color_rgb[0]},{color_rgb[1]},{color_rgb[2]},0.85)",
@@ -579,15 +705,60 @@ if run:
         </div>
         """, unsafe_allow_html=True)
 
+    # ── Signal timeline ────────────────────────────────────────────────────────
+    st.markdown('<div class="section-label">Signal Timeline</div>', unsafe_allow_html=True)
+
+    n_sig = len(SIGNALS)
+    # One cell per candle bucket, showing the signal at the bucket's first bar
+    starts = bucket_starts(len(chart_df), CHART_MAX_POINTS)
+    timeline = codes[-len(chart_df):][starts].T
+    fig3 = go.Figure(go.Heatmap(
+        x=chart_x[starts],
+        y=[cfg["label"] for cfg in TIMEFRAMES.values()],
+        z=timeline,
+        customdata=np.array(SIGNALS)[timeline],
+        hovertemplate="%{y} · %{x|%Y-%m-%d}<br>%{customdata}<extra></extra>",
+        zmin=-0.5, zmax=n_sig - 0.5,
+        colorscale=[[(k + edge) / n_sig, color]
+                    for k, color in enumerate(SIGNAL_TIMELINE_COLORS) for edge in (0, 1)],
+        showscale=False,
+        xgap=1 if len(starts) <= 365 else 0, ygap=3,
+    ))
+    fig3.update_layout(**_LAYOUT, height=150, xaxis=dict(**_AXIS), yaxis=dict(**_AXIS, autorange="reversed"))
+    st.plotly_chart(fig3, use_container_width=True)
+
+    labels = [cfg["label"] for cfg in TIMEFRAMES.values()]
+    follow_rows = []
+    for code in (SIGNALS.index("BULLISH BREAKOUT"), SIGNALS.index("BEARISH BREAKDOWN")):
+        for lead in range(len(labels)):
+            for follow in range(lead + 1, len(labels)):
+                onsets, followed = signal_followthrough(codes, lead, follow, code, FOLLOW_DAYS * bars_per_day)
+                follow_rows.append({
+                    "Signal":   SIGNALS[code].title(),
+                    "Sequence": f"{labels[lead]} → {labels[follow]}",
+                    "Onsets":   onsets,
+                    "Followed": followed,
+                    "Rate":     f"{followed / onsets:.0%}" if onsets else "—",
+                })
+    st.caption(f"How often a longer horizon gave the same signal within {FOLLOW_DAYS} trading days of a "
+               f"shorter one · {len(combined):,} bars in the {period} period")
+    st.dataframe(pd.DataFrame(follow_rows), use_container_width=True, hide_index=True)
+
+    with st.expander("Bar-to-bar signal transitions"):
+        counts = signal_transitions(codes)
+        for j, label in enumerate(labels):
+            st.caption(label)
+            st.dataframe(pd.DataFrame(counts[j], index=SIGNALS, columns=SIGNALS), use_container_width=True)
+
     # ── Levels reference table ─────────────────────────────────────────────────
     st.markdown('<div class="section-label">Current Levels Reference</div>', unsafe_allow_html=True)
 
     table_rows = []
-    for name, cfg in TIMEFRAMES.items():
+    for j, (name, cfg) in enumerate(TIMEFRAMES.items()):
         upper = last[f"{name}_upper"]
         lower = last[f"{name}_lower"]
         ma    = last[f"{name}_ma"]
-        sig_label, _, sig_fg = get_signal(close_now, upper, lower, ma)
+        sig_label = SIGNALS[codes[-1, j]]
         dist_upper = (upper - close_now) / close_now * 100
         dist_lower = (close_now - lower) / close_now * 100
         table_rows.append({
@@ -596,17 +767,44 @@ if run:
             "Mid (MA)":    f"${ma:,.2f}",
             "Resistance":  f"${upper:,.2f}",
             "Signal":      sig_label,
+            "H":           f"{H:.3f}",
             "To Resist.":  f"+{dist_upper:.2f}%",
             "To Support":  f"-{dist_lower:.2f}%",
         })
 
     st.dataframe(pd.DataFrame(table_rows), use_container_width=True, hide_index=True)
 
+    # ── Backtest ───────────────────────────────────────────────────────────────
+    st.markdown('<div class="section-label">Walk-Forward Backtest — Fractal vs Classical Bands</div>',
+                unsafe_allow_html=True)
+
+    bt = backtest_bands(df, effective_H, cost_bps=cost_bps, long_only=long_only,
+                        bars_per_year=bars_per_year).reset_index()
+    pct_cols = ["total_return", "cagr", "max_drawdown", "hit_rate", "exposure"]
+    bt[pct_cols] = bt[pct_cols] * 100
+    st.dataframe(
+        bt.rename(columns={
+            "total_return": "Return", "cagr": "CAGR", "max_drawdown": "Max DD", "hit_rate": "Hit Rate",
+            "trades": "Trades", "turnover": "Turnover / yr", "exposure": "Exposure",
+        }),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            col: st.column_config.NumberColumn(format="%.1f%%") for col in ("Return", "CAGR", "Max DD", "Hit Rate", "Exposure")
+        } | {"Turnover / yr": st.column_config.NumberColumn(format="%.2f")},
+    )
+    st.caption(
+        "Long on a breakout close, " + ("flat" if long_only else "short") + " on a breakdown close, held to the "
+        f"opposite signal; positions earn the next bar's return net of {cost_bps:g} bps per unit traded. "
+        + ("Full-period H is fitted on the whole history — use a rolling H estimate for a look-ahead-free test."
+           if h_window is None and use_hurst else "Rolling H uses only past bars.")
+    )
+
     st.markdown(f"""
     <div style="font-family:'Fira Code',monospace;font-size:0.56rem;color:rgba(74,90,104,0.45);
     text-align:right;margin-top:1.2rem;letter-spacing:0.06em;">
         {ticker} · H={H:.3f} · exponent={'H (fractal)' if use_hurst else '0.5 (classical)'} ·
-        {len(df)} trading days · Not investment advice
+        {len(df):,} {interval} bars · Not investment advice
     </div>
     """, unsafe_allow_html=True)
 
@@ -0,0 +1,77 @@
+"""
+Streamlit-free analytics core shared by the hurst-app and fractal-range-app.
+
+The Hurst engine and chart downsampling only need NumPy and import eagerly.
+The pandas-backed band, store, bar store, screener, backtest, sweep and
+stream modules load on first attribute access, so batch jobs that only estimate H
+never pay for importing pandas.
+"""
+import importlib
+
+from shared_core import TokenBucket
+
+from .downsample import CHART_MAX_POINTS, bucket_starts, downsample_bars, lttb_indices
+from .estimators import (
+    HURST_ESTIMATORS,
+    RS_LOG_POINTS,
+    estimate_hurst,
+    estimate_hurst_batch,
+    rolling_hurst,
+)
+from .hurst import (
+    hurst_batch,
+    hurst_rs,
+    rolling_hurst_all,
+    rolling_hurst_series,
+    rs_fit,
+    stack_closes,
+)
+from .regime import REGIME_BOUNDS, classify_regime
+
+_LAZY = {
+    "TIMEFRAMES": "bands",
+    "SIGNALS": "bands",
+    "H_CLIP": "bands",
+    "BARS_PER_DAY": "bands",
+    "bar_windows": "bands",
+    "rolling_band_h": "bands",
+    "band_parts": "bands",
+    "band_levels": "bands",
+    "compute_range_pair": "bands",
+    "compute_ranges": "bands",
+    "get_signal": "bands",
+    "classify_signals": "bands",
+    "signal_codes": "bands",
+    "signal_transitions": "bands",
+    "signal_followthrough": "bands",
+    "OHLCV": "store",
+    "load_history": "store",
+    "slice_period": "store",
+    "read_history": "store",
+    "top_up_many": "store",
+    "read_bars": "barstore",
+    "load_bars": "barstore",
+    "screen": "screener",
+    "screen_ticker": "screener",
+    "backtest_bands": "backtest",
+    "backtest_positions": "backtest",
+    "band_positions": "backtest",
+    "sweep": "sweep",
+    "window_grid": "sweep",
+    "BandStream": "stream",
+    "ReplayFeed": "stream",
+}
+
+__all__ = [
+    "CHART_MAX_POINTS", "HURST_ESTIMATORS", "RS_LOG_POINTS", "REGIME_BOUNDS", "TokenBucket",
+    "bucket_starts", "classify_regime", "downsample_bars", "estimate_hurst", "estimate_hurst_batch",
+    "hurst_batch", "hurst_rs", "lttb_indices", "rolling_hurst", "rolling_hurst_all",
+    "rolling_hurst_series", "rs_fit", "stack_closes",
+    *_LAZY,
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
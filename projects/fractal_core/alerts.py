@@ -0,0 +1,214 @@
+"""
+Headless range-band alert daemon.
+
+Each cycle tops up the price store for the watch list in batched yfinance
+requests, recomputes every ticker's bands and signals with the screener,
+and alerts when a horizon's signal differs from the last one recorded.
+Last-known signals are kept in SQLite, so a restarted daemon carries on
+without re-alerting; the first time a ticker is seen its signals are only
+recorded. Tickers are handled ALERT_BATCH at a time, so memory stays flat
+however long the watch list.
+
+    python -m fractal_core.alerts --file watchlist.txt --every 900
+    python -m fractal_core.alerts SPY QQQ --once --webhook https://example.com/hook
+"""
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+from shared_core import TokenBucket
+
+from .bands import TIMEFRAMES
+from .screener import screen
+from .store import top_up_many
+
+ALERT_DB = Path(os.environ.get("ALERT_DB", Path.home() / ".cache" / "fractal-markets" / "alerts.sqlite"))
+# Tickers refreshed, evaluated and committed together
+ALERT_BATCH = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    ticker  TEXT NOT NULL,
+    horizon TEXT NOT NULL,
+    signal  TEXT NOT NULL,
+    close   REAL,
+    bar     TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (ticker, horizon)
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    created  REAL NOT NULL,
+    ticker   TEXT NOT NULL,
+    horizon  TEXT NOT NULL,
+    signal   TEXT NOT NULL,
+    previous TEXT NOT NULL,
+    close    REAL,
+    bar      TEXT
+);
+"""
+
+_UPSERT = """
+INSERT INTO signals (ticker, horizon, signal, close, bar, updated) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (ticker, horizon) DO UPDATE SET
+    signal = excluded.signal, close = excluded.close, bar = excluded.bar, updated = excluded.updated
+"""
+
+
+def open_db(path=None) -> sqlite3.Connection:
+    path = Path(path or ALERT_DB)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.executescript(_SCHEMA)
+    return con
+
+
+def record_signals(con: sqlite3.Connection, rows: list) -> list:
+    """
+    Store the signals of screener rows and return an alert dict for each
+    horizon whose signal changed since the stored one. Signals and alerts
+    are written in one transaction, so an interrupted cycle neither loses
+    nor repeats an alert.
+    """
+    if not rows:
+        return []
+    tickers = [r["Ticker"] for r in rows]
+    known = {(t, h): s for t, h, s in con.execute(
+        f"SELECT ticker, horizon, signal FROM signals WHERE ticker IN ({','.join('?' * len(tickers))})", tickers)}
+
+    now = time.time()
+    alerts, upserts = [], []
+    for r in rows:
+        close, bar = float(r["Close"]), str(r["Last Bar"])
+        for name, cfg in TIMEFRAMES.items():
+            sig, prev = r[cfg["label"]], known.get((r["Ticker"], name))
+            if prev is not None and prev != sig:
+                alerts.append({"created": now, "ticker": r["Ticker"], "horizon": name, "signal": sig,
+                               "previous": prev, "close": close, "bar": bar})
+            upserts.append((r["Ticker"], name, sig, close, bar, now))
+
+    with con:
+        con.executemany(_UPSERT, upserts)
+        con.executemany("INSERT INTO alerts (created, ticker, horizon, signal, previous, close, bar) "
+                        "VALUES (:created, :ticker, :horizon, :signal, :previous, :close, :bar)", alerts)
+    return alerts
+
+
+def run_cycle(con: sqlite3.Connection, tickers: list, period: str = "5y", h_window: Optional[int] = None,
+              workers: Optional[int] = None, limiter: Optional[TokenBucket] = None, refresh: bool = True,
+              on_alerts=None, stop: Optional[threading.Event] = None) -> dict:
+    """
+    One pass over the watch list, ALERT_BATCH tickers at a time: top up the
+    store (unless refresh=False), screen, record. on_alerts(list) is called
+    with each batch's alerts once they are committed. A batch that raises is
+    logged and counted as failed, and the pass moves on. A set stop event
+    ends the pass between batches. Returns counts for the cycle.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    start = time.monotonic()
+    summary = {"tickers": len(tickers), "evaluated": 0, "skipped": 0, "no_data": 0, "failed": 0, "alerts": 0}
+    for i in range(0, len(tickers), ALERT_BATCH):
+        if stop is not None and stop.is_set():
+            break
+        batch = tickers[i:i + ALERT_BATCH]
+        try:
+            if refresh:
+                summary["no_data"] += len(top_up_many(batch, limiter))
+            table = screen(batch, period, h_window, workers)
+            alerts = record_signals(con, table.to_dict("records"))
+        except Exception as e:
+            _log(f"batch {batch[0]}..{batch[-1]} failed: {e!r}")
+            summary["failed"] += len(batch)
+            continue
+        summary["evaluated"] += len(table)
+        summary["skipped"] += len(table.attrs["skipped"])
+        summary["alerts"] += len(alerts)
+        if alerts and on_alerts:
+            on_alerts(alerts)
+    summary["seconds"] = round(time.monotonic() - start, 2)
+    return summary
+
+
+# ── Sinks ─────────────────────────────────────────────────────────────────────
+def print_alerts(alerts: list):
+    for a in alerts:
+        print(json.dumps(a), flush=True)
+
+
+def webhook_sink(url: str, timeout: float = 10.0):
+    """on_alerts callback POSTing each batch of alerts to url as a JSON list; failures are logged, not raised."""
+    def post(alerts: list):
+        req = urllib.request.Request(url, data=json.dumps(alerts).encode(),
+                                     headers={"Content-Type": "application/json"})
+        try:
+            urllib.request.urlopen(req, timeout=timeout).close()
+        except OSError as e:
+            _log(f"webhook failed for {len(alerts)} alerts: {e}")
+    return post
+
+
+def _log(msg: str):
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {msg}", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tickers", nargs="*")
+    ap.add_argument("--file", help="file of tickers, whitespace or comma separated")
+    ap.add_argument("--every", type=float, default=900, help="seconds between cycle starts")
+    ap.add_argument("--once", action="store_true", help="run one cycle and exit")
+    ap.add_argument("--period", default="5y")
+    ap.add_argument("--h-window", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--rate", type=float, default=2.0, help="yfinance requests per second")
+    ap.add_argument("--no-refresh", action="store_true", help="evaluate the store as is")
+    ap.add_argument("--db", default=None, help=f"SQLite state file (default {ALERT_DB})")
+    ap.add_argument("--webhook", help="POST alerts here as JSON as well as printing them")
+    args = ap.parse_args(argv)
+
+    tickers = [t.upper() for t in args.tickers]
+    if args.file:
+        with open(args.file) as f:
+            tickers += [t.strip().upper() for t in f.read().replace(",", " ").split() if t.strip()]
+    if not tickers:
+        ap.error("no tickers given")
+
+    sinks = [print_alerts] + ([webhook_sink(args.webhook)] if args.webhook else [])
+
+    def on_alerts(alerts):
+        for sink in sinks:
+            sink(alerts)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    con = open_db(args.db)
+    limiter = TokenBucket(args.rate)
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                summary = run_cycle(con, tickers, args.period, args.h_window, args.workers, limiter,
+                                    refresh=not args.no_refresh, on_alerts=on_alerts, stop=stop)
+                _log(" ".join(f"{k}={v}" for k, v in summary.items()))
+            except Exception as e:
+                _log(f"cycle failed: {e!r}")
+            if args.once:
+                break
+            stop.wait(max(args.every - (time.monotonic() - started), 0))
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
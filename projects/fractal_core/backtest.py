@@ -0,0 +1,118 @@
+"""
+Vectorized walk-forward backtest of the Trade/Trend/Tail band signals.
+
+A horizon goes long on the close of a BULLISH BREAKOUT bar and short (or
+flat, long_only) on a BEARISH BREAKDOWN, holding until the opposite event.
+The position decided on bar t earns bar t+1's return, so nothing trades on
+information it couldn't have had. All bars and horizons are processed as
+arrays; there is no Python loop over time.
+"""
+import numpy as np
+import pandas as pd
+
+from .bands import BREAKDOWN, BREAKOUT, TIMEFRAMES, compute_range_pair, signal_codes
+
+
+def band_positions(codes: np.ndarray, long_only: bool = False) -> np.ndarray:
+    """
+    Target position after each bar's close from signal codes, same shape:
+    +1 from a breakout, -1 (0 if long_only) from a breakdown, carried forward
+    until the opposite event. 0 before the first event.
+    """
+    codes = np.asarray(codes)
+    event = np.full(codes.shape, np.nan)
+    event[codes == BREAKOUT] = 1.0
+    event[codes == BREAKDOWN] = 0.0 if long_only else -1.0
+    event[0] = np.where(np.isnan(event[0]), 0.0, event[0])
+
+    # Forward-fill: index of the latest event at or before each bar
+    rows = np.arange(len(event)).reshape(-1, *([1] * (event.ndim - 1)))
+    latest = np.maximum.accumulate(np.where(np.isnan(event), 0, rows), axis=0)
+    return np.take_along_axis(event, latest, axis=0)
+
+
+def backtest_positions(close: np.ndarray, positions: np.ndarray, cost_bps: float = 5.0,
+                       bars_per_year: int = 252) -> dict:
+    """
+    Performance of target positions (n_bars, n_strategies) on one price
+    series. cost_bps is charged per unit of position traded. Returns arrays
+    per strategy: total_return, cagr, max_drawdown, hit_rate (share of
+    closed-or-open trades with a positive return net of their entry and
+    exit costs), trades, turnover (units traded per year) and exposure
+    (share of bars in the market).
+    """
+    close = np.asarray(close, dtype=float)
+    pos = np.asarray(positions, dtype=float).reshape(len(close), -1)
+    n, k = pos.shape
+
+    ret = np.zeros(n)
+    ret[1:] = close[1:] / close[:-1] - 1
+    held = np.zeros_like(pos)
+    held[1:] = pos[:-1]
+    traded = np.abs(np.diff(held, axis=0, prepend=0.0))
+    gross = held * ret[:, None]
+    strat = gross - traded * cost_bps / 1e4
+
+    equity = np.cumprod(1 + strat, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    years = max(n - 1, 1) / bars_per_year
+
+    # Trades: runs of constant non-zero held position, numbered per strategy
+    # and offset so one bincount covers every column
+    change = np.diff(held, axis=0, prepend=0.0) != 0
+    trade_id = np.cumsum(change, axis=0) + np.arange(k) * (n + 1)
+    in_trade = held != 0
+    # Split each bar's traded units into the leg closing (or cutting) the
+    # previous run and the leg opening the new one, so an exit or the first
+    # half of a flip is charged to the trade it closes
+    prev = np.zeros_like(held)
+    prev[1:] = held[:-1]
+    kept = np.where(np.sign(prev) == np.sign(held), np.minimum(np.abs(prev), np.abs(held)), 0.0)
+    closing = np.abs(prev) - kept
+    opening = np.abs(held) - kept
+    closed = closing > 0
+    trade_log = np.bincount(
+        np.concatenate([trade_id[in_trade], trade_id[closed] - 1]),
+        weights=np.concatenate([np.log1p(gross[in_trade] - opening[in_trade] * cost_bps / 1e4),
+                                np.log1p(-closing[closed] * cost_bps / 1e4)]),
+        minlength=k * (n + 1)).reshape(k, n + 1)
+    trade_seen = np.bincount(trade_id[in_trade], minlength=k * (n + 1)).reshape(k, n + 1) > 0
+    n_trades = trade_seen.sum(axis=1)
+    wins = (trade_seen & (trade_log > 0)).sum(axis=1)
+
+    total = equity[-1] - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "total_return": total,
+            "cagr": np.sign(1 + total) * np.abs(1 + total) ** (1 / years) - 1,
+            "max_drawdown": drawdown.min(axis=0),
+            "hit_rate": np.where(n_trades > 0, wins / np.maximum(n_trades, 1), np.nan),
+            "trades": n_trades,
+            "turnover": traded.sum(axis=0) / years,
+            "exposure": in_trade.mean(axis=0),
+        }
+
+
+def backtest_bands(df: pd.DataFrame, H, cost_bps: float = 5.0, long_only: bool = False,
+                   bars_per_year: int = 252) -> pd.DataFrame:
+    """
+    Backtest every horizon on H-scaled and classical sqrt(T) bands, plus buy
+    and hold. H is a float or one value per bar (rolling_band_h keeps the
+    test free of look-ahead; a full-period H is fitted on the whole history).
+    One row per (Bands, Horizon).
+    """
+    close = df["Close"].values
+    fractal, classical = compute_range_pair(df, H, bars_per_year)
+    positions = np.concatenate([
+        band_positions(signal_codes(close, fractal), long_only),
+        band_positions(signal_codes(close, classical), long_only),
+        np.ones((len(close), 1)),
+    ], axis=1)
+    stats = backtest_positions(close, positions, cost_bps, bars_per_year)
+
+    labels = [cfg["label"] for cfg in TIMEFRAMES.values()]
+    index = pd.MultiIndex.from_tuples(
+        [("Fractal (H)", l) for l in labels] + [("Classical (√T)", l) for l in labels] + [("Buy & Hold", "—")],
+        names=["Bands", "Horizon"],
+    )
+    return pd.DataFrame(stats, index=index)
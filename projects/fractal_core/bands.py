@@ -0,0 +1,205 @@
+"""
+Fractal Trade/Trend/Tail volatility bands and the band signal rules.
+"""
+import numpy as np
+import pandas as pd
+
+from .hurst import rolling_hurst_all
+
+TIMEFRAMES = {
+    "trade": {"window": 21,  "label": "Trade",  "desc": "3 weeks",   "color": "#F0A500"},
+    "trend": {"window": 63,  "label": "Trend",  "desc": "3 months",  "color": "#5B9BD5"},
+    "tail":  {"window": 252, "label": "Tail",   "desc": "12 months", "color": "#9B7FE8"},
+}
+
+# Bars per trading day by bar interval (US equity session: 6.5 hours, with
+# the last hourly bar a half hour). TIMEFRAMES windows are in trading days
+# and scale by this; volatility annualizes over 252 * bars per day.
+BARS_PER_DAY = {"1d": 1, "1h": 7, "5m": 78, "1m": 390}
+
+# H is clipped before it is used as a band exponent
+H_CLIP = (0.01, 0.99)
+
+# Signal codes are indices into SIGNALS, ordered bearish to bullish
+SIGNALS = ["NO DATA", "BEARISH BREAKDOWN", "BEARISH", "BULLISH", "BULLISH BREAKOUT"]
+NO_DATA, BREAKDOWN, BEARISH, BULLISH, BREAKOUT = range(len(SIGNALS))
+
+
+def rolling_band_h(close: np.ndarray, window: int = 252, clip: tuple = H_CLIP) -> np.ndarray:
+    """
+    Point-in-time band exponent: the R/S H of the trailing `window` bars at
+    every bar, clipped to `clip`. NaN until a full window is available, so a
+    band never uses prices after its own date.
+    """
+    return np.clip(rolling_hurst_all(close, window), *clip)
+
+
+def _prefix_sums(x: np.ndarray):
+    """
+    Prefix sums of x, x^2 and the count of finite values, each with a leading
+    zero. x is shifted by its mean first so window sums don't cancel badly.
+    """
+    ok = np.isfinite(x)
+    shift = x[ok].mean() if ok.any() else 0.0
+    d = np.where(ok, x - shift, 0.0)
+    zero = np.zeros(1)
+    return (shift,
+            np.concatenate((zero, np.cumsum(d))),
+            np.concatenate((zero, np.cumsum(d * d))),
+            np.concatenate(([0], np.cumsum(ok))))
+
+
+def _window_moments(prefix, N: int):
+    """
+    Trailing N-bar mean and sample variance at every bar from _prefix_sums
+    output. NaN until N finite values are available, like rolling(N).
+    """
+    shift, s1, s2, cnt = prefix
+    n = len(s1) - 1
+    mean = np.full(n, np.nan)
+    var = np.full(n, np.nan)
+    if N > n:
+        return mean, var
+    w1 = s1[N:] - s1[:-N]
+    w2 = s2[N:] - s2[:-N]
+    full = (cnt[N:] - cnt[:-N]) == N
+    mean[N - 1:] = np.where(full, shift + w1 / N, np.nan)
+    var[N - 1:] = np.where(full, np.maximum(w2 - w1 * w1 / N, 0.0) / max(N - 1, 1), np.nan)
+    return mean, var
+
+
+def bar_windows(bars_per_year: int = 252) -> dict:
+    """TIMEFRAMES windows in bars: {name: N} for bars of the given frequency."""
+    return {name: int(round(cfg["window"] * bars_per_year / 252)) for name, cfg in TIMEFRAMES.items()}
+
+
+def band_parts(close: np.ndarray, windows, bars_per_year: int = 252) -> dict:
+    """
+    Exponent-free band inputs for each window of N bars: {N: (ma, width)}
+    where width = hvol(N) * close, so a band is
+    ma ± width * (N/bars_per_year)^exponent.
+
+    One prefix-sum pass over close and log returns serves every window, so
+    the cost is O(n) per window however long the bars are.
+    """
+    close = np.asarray(close, dtype=float)
+    log_ret = np.empty_like(close)
+    log_ret[:1] = np.nan
+    log_ret[1:] = np.log(close[1:] / close[:-1])
+
+    p_close = _prefix_sums(close)
+    p_ret = _prefix_sums(log_ret)
+    out = {}
+    for N in windows:
+        ma, _ = _window_moments(p_close, N)
+        _, var = _window_moments(p_ret, N)
+        out[N] = (ma, np.sqrt(var) * np.sqrt(bars_per_year) * close)
+    return out
+
+
+def band_levels(parts: dict, N: int, exponent, bars_per_year: int = 252):
+    """(upper, lower, ma) arrays for window N from band_parts output."""
+    ma, width = parts[N]
+    sigma = width * (N / bars_per_year) ** exponent
+    return ma + sigma, ma - sigma, ma
+
+
+def _frame(parts: dict, exponent, index, bars_per_year: int) -> pd.DataFrame:
+    out = {}
+    for name, N in bar_windows(bars_per_year).items():
+        upper, lower, ma = band_levels(parts, N, exponent, bars_per_year)
+
+        out[f"{name}_upper"] = upper
+        out[f"{name}_lower"] = lower
+        out[f"{name}_ma"]    = ma
+
+    return pd.DataFrame(out, index=index)
+
+
+def compute_ranges(df: pd.DataFrame, H, use_hurst: bool = True, bars_per_year: int = 252) -> pd.DataFrame:
+    """
+    Compute fractal-adjusted Trade/Trend/Tail support & resistance.
+
+    Band width = hvol(N) * close * (N/252)^exponent
+    where exponent = H (fractal) or 0.5 (classical). H is a float or one
+    value per bar (e.g. rolling_band_h). For intraday bars pass
+    bars_per_year (252 * BARS_PER_DAY[interval]); windows and annualization
+    scale with it.
+    """
+    parts = band_parts(df["Close"].values, bar_windows(bars_per_year).values(), bars_per_year)
+    return _frame(parts, H if use_hurst else 0.5, df.index, bars_per_year)
+
+
+def compute_range_pair(df: pd.DataFrame, H, bars_per_year: int = 252):
+    """
+    Fractal (exponent H) and classical (exponent 0.5) ranges from one pass
+    over the history. Returns (fractal, classical), each shaped like
+    compute_ranges output.
+    """
+    parts = band_parts(df["Close"].values, bar_windows(bars_per_year).values(), bars_per_year)
+    return _frame(parts, H, df.index, bars_per_year), _frame(parts, 0.5, df.index, bars_per_year)
+
+
+def get_signal(close_val: float, upper: float, lower: float, ma: float) -> str:
+    """Classify a close against one horizon's band; one of SIGNALS."""
+    if pd.isna(upper) or pd.isna(lower):
+        return "NO DATA"
+    if close_val >= upper:
+        return "BULLISH BREAKOUT"
+    if close_val > ma:
+        return "BULLISH"
+    if close_val > lower:
+        return "BEARISH"
+    return "BEARISH BREAKDOWN"
+
+
+def classify_signals(close, upper, lower, ma) -> np.ndarray:
+    """
+    Vectorized get_signal: int8 codes into SIGNALS for every element, with
+    the arguments broadcast together (e.g. close (n, 1) against bands (n, 3)).
+    Relies on lower <= ma <= upper, which holds for every band built here.
+    """
+    close, upper, lower, ma = np.broadcast_arrays(close, upper, lower, ma)
+    with np.errstate(invalid="ignore"):
+        codes = (close > lower).view(np.int8) + (close > ma).view(np.int8) + np.int8(BREAKDOWN)
+        codes[close >= upper] = BREAKOUT
+    codes[np.isnan(upper) | np.isnan(lower)] = NO_DATA
+    return codes
+
+
+def signal_codes(close: np.ndarray, ranges: pd.DataFrame) -> np.ndarray:
+    """Signal codes for every bar and horizon: (n_bars, len(TIMEFRAMES)) int8."""
+    values, names = ranges.to_numpy(dtype=float), list(ranges.columns)
+    cols = lambda part: values[:, [names.index(f"{name}_{part}") for name in TIMEFRAMES]]
+    return classify_signals(np.asarray(close, dtype=float)[:, None], cols("upper"), cols("lower"), cols("ma"))
+
+
+def signal_transitions(codes: np.ndarray) -> np.ndarray:
+    """
+    Bar-to-bar transition counts per horizon: (n_horizons, 5, 5) where
+    [h, a, b] counts bars whose signal went from code a to code b.
+    """
+    codes = np.asarray(codes).reshape(len(codes), -1).astype(np.intp)
+    k = len(SIGNALS)
+    pair = codes[:-1] * k + codes[1:] + np.arange(codes.shape[1]) * k * k
+    return np.bincount(pair.ravel(), minlength=codes.shape[1] * k * k).reshape(-1, k, k)
+
+
+def _onsets(col: np.ndarray, code: int) -> np.ndarray:
+    hit = col == code
+    return hit & ~np.concatenate(([False], hit[:-1]))
+
+
+def signal_followthrough(codes: np.ndarray, lead: int, follow: int, code: int = BREAKOUT,
+                         within: int = 21) -> tuple:
+    """
+    How often horizon `follow` entered signal `code` within `within` bars
+    after horizon `lead` entered it (columns of codes, e.g. Trade -> Tail
+    breakouts). Returns (lead onsets, onsets followed).
+    """
+    lead_on = np.flatnonzero(_onsets(codes[:, lead], code))
+    follow_cum = np.concatenate(([0], np.cumsum(_onsets(codes[:, follow], code))))
+    end = np.minimum(lead_on + within, len(codes) - 1)
+    followed = follow_cum[end + 1] - follow_cum[lead_on + 1] > 0
+    return len(lead_on), int(followed.sum())
+
@@ -0,0 +1,184 @@
+"""
+Intraday bar store: one memory-mapped file per column per ticker/interval.
+
+Timestamps are int64 UTC nanoseconds and OHLCV float32, so a million minute
+bars take ~28 MB on disk and reading them maps the files instead of
+parsing them. New bars are appended in place; meta.json records how many
+rows are complete, so a crash mid-append leaves the committed rows intact.
+The last row is the one exception: yfinance re-quotes the bar still
+forming, and each top-up overwrites it with the newer quote. A store left
+longer than yfinance's lookback can't be filled back in; the missing span
+is recorded in meta.json as a gap.
+
+yfinance only serves recent intraday history (7 days of 1m, 60 of 5m, 730
+of 1h), so the store is what lets the history grow past that window.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from shared_core import TokenBucket
+
+from .bands import BARS_PER_DAY
+from .store import OHLCV, _download
+
+BAR_STORE_DIR = Path(os.environ.get("BAR_STORE_DIR", Path.home() / ".cache" / "fractal-markets" / "bars"))
+BAR_REFRESH_SECS = 60
+
+# How far back yfinance serves each interval
+INTERVAL_LOOKBACK_DAYS = {"1m": 7, "5m": 60, "1h": 730}
+
+COLUMNS = {"ts": np.int64, **{c: np.float32 for c in OHLCV}}
+
+
+def bars_per_year(interval: str) -> int:
+    return 252 * BARS_PER_DAY[interval]
+
+
+def _bar_dir(ticker: str, interval: str) -> Path:
+    return BAR_STORE_DIR / ticker.replace("/", "_") / interval
+
+
+def _meta(d: Path) -> dict:
+    path = d / "meta.json"
+    if not path.exists():
+        return {"rows": 0, "tz": "UTC", "gaps": []}
+    return {"gaps": [], **json.loads(path.read_text())}
+
+
+def _write_meta(d: Path, meta: dict):
+    tmp = d / "meta.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, d / "meta.json")
+
+
+def read_bars(ticker: str, interval: str) -> dict:
+    """
+    Committed bars as read-only memmaps: {"ts": int64 ns, "Open": float32,
+    ...}. Empty arrays if nothing is stored.
+    """
+    d = _bar_dir(ticker, interval)
+    n = _meta(d)["rows"]
+    if n == 0:
+        return {c: np.empty(0, dtype=t) for c, t in COLUMNS.items()}
+    return {c: np.memmap(d / f"{c}.bin", dtype=t, mode="r", shape=(n,)) for c, t in COLUMNS.items()}
+
+
+def append_bars(ticker: str, interval: str, df: pd.DataFrame) -> int:
+    """
+    Append the rows of df (OHLCV with a DatetimeIndex) newer than the last
+    stored bar. A row with the last stored bar's timestamp replaces it in
+    place, so a bar stored while still forming ends up complete. Returns the
+    number of rows added or replaced.
+    """
+    d = _bar_dir(ticker, interval)
+    meta = _meta(d)
+    n = meta["rows"]
+    if df.empty:
+        return 0
+    index = df.index.tz_convert("UTC") if df.index.tz is not None else df.index
+    ts = index.as_unit("ns").asi8
+    base = n
+    if n:
+        last = np.memmap(d / "ts.bin", dtype=np.int64, mode="r", shape=(n,))[-1]
+        keep = ts >= last
+        df, ts = df[keep], ts[keep]
+        if len(ts) and ts[0] == last:
+            base = n - 1
+    if df.empty:
+        return 0
+
+    d.mkdir(parents=True, exist_ok=True)
+    for c, t in COLUMNS.items():
+        path = d / f"{c}.bin"
+        size = np.dtype(t).itemsize
+        values = ts if c == "ts" else df[c].values
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            # Drop anything past the committed rows left by an interrupted append,
+            # but never the committed rows themselves: the re-quoted last row is
+            # overwritten in place
+            f.truncate(n * size)
+            f.seek(base * size)
+            f.write(np.ascontiguousarray(values, dtype=t).tobytes())
+
+    _write_meta(d, {**meta, "rows": base + len(df), "tz": str(df.index.tz or meta["tz"])})
+    return len(df)
+
+
+def top_up_bars(ticker: str, interval: str, limiter: Optional[TokenBucket] = None) -> int:
+    """
+    Fetch bars newer than the store holds (or the full yfinance lookback when
+    the store is empty or further behind than that). Skips the network if
+    refreshed within BAR_REFRESH_SECS. Returns the number of rows added or
+    replaced.
+
+    A failed download leaves the store (and its refresh time) as it was, so
+    the stored bars are served and the next call retries; it only raises
+    when nothing is stored. If the store is further behind than the lookback
+    and the fetched bars don't reach back to its last bar, the span between
+    them is recorded as a gap (see load_bars).
+    """
+    d = _bar_dir(ticker, interval)
+    meta_path = d / "meta.json"
+    if meta_path.exists() and time.time() - meta_path.stat().st_mtime < BAR_REFRESH_SECS:
+        return 0
+    lookback = INTERVAL_LOOKBACK_DAYS[interval]
+    ts = read_bars(ticker, interval)["ts"]
+    last = int(ts[-1]) if len(ts) else None
+    behind = last is None or (time.time_ns() - last) / 86400e9 >= lookback - 1
+    try:
+        if behind:
+            new = _download(ticker, limiter, interval=interval, period=f"{lookback}d")
+        else:
+            start = pd.Timestamp(last, tz="UTC").strftime("%Y-%m-%d")
+            new = _download(ticker, limiter, interval=interval, start=start)
+    except Exception:
+        if last is None:
+            raise
+        return 0
+    # Every request covers the last stored bar's day or more, so nothing back
+    # means the download failed
+    if new.empty:
+        return 0
+
+    first = new.index[0].tz_convert("UTC") if new.index.tz is not None else new.index[0]
+    first = first.as_unit("ns").value
+    added = append_bars(ticker, interval, new)
+    if not added and meta_path.exists():
+        meta_path.touch()
+    if behind and last is not None and first > last:
+        meta = _meta(d)
+        _write_meta(d, {**meta, "gaps": meta["gaps"] + [[last, first]]})
+    return added
+
+
+def bars_frame(bars: dict, start: Optional[int] = None, tz: Optional[str] = None) -> pd.DataFrame:
+    """
+    DataFrame of bars[start:] (OHLCV float32 columns, DatetimeIndex in tz).
+    Only the requested tail is copied out of the memmaps.
+    """
+    sl = slice(start, None)
+    index = pd.DatetimeIndex(np.asarray(bars["ts"][sl]).view("datetime64[ns]")).tz_localize("UTC")
+    if tz:
+        index = index.tz_convert(tz)
+    return pd.DataFrame({c: np.asarray(bars[c][sl]) for c in OHLCV}, index=index)
+
+
+def load_bars(ticker: str, interval: str, limiter: Optional[TokenBucket] = None) -> pd.DataFrame:
+    """
+    Top up then return the stored bars for ticker as a DataFrame in the
+    exchange time zone. df.attrs["gaps"] lists (last bar before, first bar
+    after) for every span the store missed because it fell further behind
+    than yfinance's lookback.
+    """
+    top_up_bars(ticker, interval, limiter)
+    meta = _meta(_bar_dir(ticker, interval))
+    df = bars_frame(read_bars(ticker, interval), tz=meta["tz"])
+    df.attrs["gaps"] = [tuple(pd.Timestamp(t, tz="UTC").tz_convert(meta["tz"]) for t in gap)
+                        for gap in meta["gaps"]]
+    return df
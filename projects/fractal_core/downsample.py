@@ -0,0 +1,73 @@
+"""
+Chart downsampling: keep browser payloads bounded however long the history.
+
+Bars are merged into equal buckets with envelope-preserving aggregates (the
+min/max approach), so candles and band edges keep their extremes. Single
+lines can instead be thinned with Largest-Triangle-Three-Buckets (LTTB),
+which keeps visually significant points.
+"""
+import numpy as np
+
+# Bars a chart can show before they are merged; roughly one per pixel of a
+# wide chart
+CHART_MAX_POINTS = 1500
+
+_REDUCE = {
+    "first": lambda a, starts: a[starts],
+    "last":  lambda a, starts: a[np.r_[starts[1:], len(a)] - 1],
+    "max":   lambda a, starts: np.fmax.reduceat(a, starts),
+    "min":   lambda a, starts: np.fmin.reduceat(a, starts),
+    "sum":   lambda a, starts: np.add.reduceat(np.nan_to_num(a), starts),
+    "mean":  lambda a, starts: np.add.reduceat(np.nan_to_num(a), starts)
+                              / np.add.reduceat(~np.isnan(a), starts).clip(1),
+}
+
+
+def bucket_starts(n: int, n_out: int) -> np.ndarray:
+    """Start index of each of n_out near-equal buckets over n bars (all bars if n <= n_out)."""
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n, n_out, endpoint=False).astype(np.intp))
+
+
+def downsample_bars(x: np.ndarray, columns: dict, how: dict, n_out: int = CHART_MAX_POINTS):
+    """
+    Merge bars into at most n_out buckets. columns maps name -> array aligned
+    with x; how maps name -> "first" | "last" | "max" | "min" | "sum" | "mean"
+    (NaN-aware). Each bucket is stamped with its first x. Returns (x, columns).
+    """
+    starts = bucket_starts(len(x), n_out)
+    if len(starts) == len(x):
+        return np.asarray(x), {k: np.asarray(v) for k, v in columns.items()}
+    out = {k: _REDUCE[how[k]](np.asarray(v, dtype=float), starts) for k, v in columns.items()}
+    return np.asarray(x)[starts], out
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = CHART_MAX_POINTS) -> np.ndarray:
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps from the line
+    (x, y): the first and last point plus, from each of n_out - 2 buckets,
+    the point forming the largest triangle with the previous pick and the
+    next bucket's mean. x must be numeric (view datetimes as int64).
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.r_[np.linspace(1, n - 1, n_out - 1).astype(np.intp), n]
+    # Mean of every bucket (the last "bucket" is the final point); bucket i
+    # is scored against the mean of bucket i + 1
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x, edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y, edges[:-1]) / sizes
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
@@ -0,0 +1,144 @@
+"""
+Hurst estimator registry.
+
+Each estimator takes a (n_series, n_bars) matrix of complete price series and
+returns H per row (NaN where undefined), so the same code serves one ticker,
+a batch of tickers or every rolling window at once.
+"""
+import functools
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .hurst import _chunk_sizes, _loglog_slope, _rs_matrix, _segments, rolling_hurst_all
+
+
+def _log_returns(P: np.ndarray) -> np.ndarray:
+    return np.diff(np.log(np.maximum(P, 1e-12)), axis=1)
+
+
+def _log_scales(lo: int, hi: int, num: int = 16) -> list:
+    """Up to num distinct integer scales, log-spaced from lo to hi."""
+    if hi < lo:
+        return []
+    return sorted(set(np.geomspace(lo, hi, num).astype(int).tolist()))
+
+
+def _h_rs(P: np.ndarray, min_chunk: int = 20, log_points: Optional[int] = None) -> np.ndarray:
+    """Rescaled range: slope of log mean R/S on log chunk size."""
+    log_ret = _log_returns(P)
+    sizes = _chunk_sizes(log_ret.shape[1], min_chunk, log_points)
+    if len(sizes) < 3:
+        return np.full(len(P), np.nan)
+    with np.errstate(divide="ignore"):
+        return _loglog_slope(sizes, np.log(_rs_matrix(log_ret, sizes)))
+
+
+def _h_dfa(P: np.ndarray, min_scale: int = 10) -> np.ndarray:
+    """
+    Detrended fluctuation analysis (DFA-1): RMS residual of a per-segment
+    linear fit to the return profile scales as scale^H.
+    """
+    x = _log_returns(P)
+    g, n = x.shape
+    scales = _log_scales(min_scale, n // 4)
+    if len(scales) < 3:
+        return np.full(g, np.nan)
+    profile = np.cumsum(x - x.mean(axis=1, keepdims=True), axis=1)
+    log_f = np.empty((g, len(scales)))
+    for j, s in enumerate(scales):
+        seg = profile[:, : (n // s) * s].reshape(g, -1, s)
+        # Closed-form least-squares line per segment on a centered time axis
+        t = np.arange(s) - (s - 1) / 2
+        centered = seg - seg.mean(axis=2, keepdims=True)
+        resid = centered - (centered * t).sum(axis=2, keepdims=True) / (t @ t) * t
+        with np.errstate(divide="ignore"):
+            log_f[:, j] = 0.5 * np.log((resid * resid).mean(axis=(1, 2)))
+    return _loglog_slope(scales, log_f)
+
+
+def _h_aggvar(P: np.ndarray, min_block: int = 2) -> np.ndarray:
+    """Aggregated variance: variance of m-bar mean returns scales as m^(2H-2)."""
+    x = _log_returns(P)
+    g, n = x.shape
+    blocks = _log_scales(min_block, n // 10)
+    if len(blocks) < 3:
+        return np.full(g, np.nan)
+    log_v = np.empty((g, len(blocks)))
+    for j, m in enumerate(blocks):
+        means = x[:, : (n // m) * m].reshape(g, -1, m).mean(axis=2)
+        with np.errstate(divide="ignore"):
+            log_v[:, j] = np.log(means.var(axis=1, ddof=1))
+    return 1 + _loglog_slope(blocks, log_v) / 2
+
+
+def _h_periodogram(P: np.ndarray) -> np.ndarray:
+    """
+    Low-frequency periodogram regression: the spectrum of the returns scales
+    as f^(1-2H) near zero. One FFT per series, O(n log n).
+    """
+    x = _log_returns(P)
+    g, n = x.shape
+    k = int(n ** 0.7)  # lowest n^0.7 Fourier frequencies
+    if k < 3:
+        return np.full(g, np.nan)
+    spec = np.fft.rfft(x - x.mean(axis=1, keepdims=True), axis=1)[:, 1 : k + 1]
+    with np.errstate(divide="ignore"):
+        log_i = np.log(np.abs(spec) ** 2 / n)
+    return (1 - _loglog_slope(np.arange(1, k + 1) / n, log_i)) / 2
+
+
+RS_LOG_POINTS = 24
+
+HURST_ESTIMATORS = {
+    "R/S": _h_rs,
+    "R/S (log grid)": functools.partial(_h_rs, log_points=RS_LOG_POINTS),
+    "DFA": _h_dfa,
+    "Aggregated Variance": _h_aggvar,
+    "Periodogram": _h_periodogram,
+}
+
+
+def estimate_hurst(prices: np.ndarray, method: str = "R/S") -> Optional[float]:
+    """H of one price series with a registered estimator, rounded like hurst_rs."""
+    H = HURST_ESTIMATORS[method](np.asarray(prices, dtype=float)[None, :])[0]
+    return None if np.isnan(H) else round(float(H), 4)
+
+
+def estimate_hurst_batch(prices: np.ndarray, mask: Optional[np.ndarray] = None,
+                         method: str = "R/S") -> np.ndarray:
+    """H per row of a ragged (n_series, n_bars) matrix; see hurst_batch for mask."""
+    prices = np.atleast_2d(np.asarray(prices, dtype=float))
+    mask = ~np.isnan(prices) if mask is None else np.asarray(mask, dtype=bool)
+    H = np.full(prices.shape[0], np.nan)
+    for rows, seg in _segments(prices, mask):
+        if seg.shape[1] > 1:
+            H[rows] = HURST_ESTIMATORS[method](seg)
+    return np.round(H, 4)
+
+
+def rolling_hurst(prices: np.ndarray, window: int, method: str = "R/S",
+                  block: int = 1 << 22) -> np.ndarray:
+    """
+    rolling_hurst_all for any registered estimator. R/S uses the incremental
+    engine; the others run over every window at once as rows of a
+    sliding-window matrix, in blocks to bound memory.
+    """
+    if method == "R/S":
+        return rolling_hurst_all(prices, window)
+    if method == "R/S (log grid)":
+        return rolling_hurst_all(prices, window, log_points=RS_LOG_POINTS)
+    prices = np.asarray(prices, dtype=float)
+    P = np.atleast_2d(prices)
+    H = np.full(P.shape, np.nan)
+    if P.shape[1] <= window:
+        return H.reshape(prices.shape)
+    view = sliding_window_view(P, window + 1, axis=1)
+    rows = max(1, block // ((window + 1) * P.shape[0]))
+    estimator = HURST_ESTIMATORS[method]
+    for lo in range(0, view.shape[1], rows):
+        windows = view[:, lo : lo + rows]
+        vals = estimator(windows.reshape(-1, window + 1)).reshape(P.shape[0], -1)
+        H[:, window + lo : window + lo + vals.shape[1]] = vals
+    return H.reshape(prices.shape)
@@ -0,0 +1,309 @@
+"""
+Rescaled-range (R/S) Hurst engine: full-period curves, batched multi-series
+analysis and an incremental rolling estimator.
+"""
+import functools
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+@functools.lru_cache(maxsize=1024)
+def _chunk_sizes(n: int, min_chunk: int = 20, log_points: Optional[int] = None) -> tuple:
+    """
+    Chunk sizes n//2, n//3, ... down to min_chunk. Only k <= n // min_chunk can
+    qualify, so the scan is O(n / min_chunk) and the result is memoized.
+
+    With log_points, thin the grid to at most that many sizes, picking the
+    ones closest to a log-spaced sequence between min_chunk and n//2. The full
+    grid has hundreds of near-duplicate sizes at the small end on long series.
+    """
+    sizes = tuple(sorted(set(n // k for k in range(2, n // min_chunk + 1))))
+    if log_points is None or len(sizes) <= log_points:
+        return sizes
+    targets = np.log(np.geomspace(sizes[0], sizes[-1], log_points))
+    picks = np.abs(np.log(sizes)[None, :] - targets[:, None]).argmin(axis=1)
+    return tuple(sizes[i] for i in sorted(set(picks.tolist())))
+
+
+def _rs_matrix(log_ret: np.ndarray, sizes: list) -> np.ndarray:
+    """
+    Mean R/S per chunk size for each row of a (n_series, n) log-return matrix.
+    Returns (n_series, len(sizes)), NaN where a size has no chunk with S > 0.
+    """
+    g, n = log_ret.shape
+    out = np.full((g, len(sizes)), np.nan)
+    for j, size in enumerate(sizes):
+        # Non-overlapping chunks as a (n_series, n_chunks, size) view
+        chunks = log_ret[:, : (n // size) * size].reshape(g, -1, size)
+        demeaned = chunks - chunks.mean(axis=2, keepdims=True)
+        dev = np.cumsum(demeaned, axis=2)
+        R = dev.max(axis=2) - dev.min(axis=2)
+        S = np.sqrt((demeaned * demeaned).sum(axis=2) / (size - 1))
+        ok = S > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total = np.where(ok, R / S, 0.0).sum(axis=1)
+            count = ok.sum(axis=1)
+            out[:, j] = np.where(count > 0, total / count, np.nan)
+    return out
+
+
+def _fit_slope(k, sx, sy, sxx, sxy) -> np.ndarray:
+    """Least-squares slope from the sums of a fit; NaN where fewer than three points."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (k * sxy - sx * sy) / (k * sxx - sx * sx)
+    return np.where(k >= 3, slope, np.nan)
+
+
+def _loglog_slope(sizes: list, log_rs: np.ndarray) -> np.ndarray:
+    """
+    Least-squares slope of log(R/S) on log(n) along the last axis, skipping NaN
+    and infinite entries. NaN where fewer than three sizes are valid.
+    """
+    w = np.isfinite(log_rs)
+    x = np.where(w, np.log(sizes), 0.0)
+    y = np.where(w, log_rs, 0.0)
+    return _fit_slope(w.sum(axis=-1), x.sum(axis=-1), y.sum(axis=-1),
+                      (x * x).sum(axis=-1), (x * y).sum(axis=-1))
+
+
+def _rs_core(prices: np.ndarray, min_chunk: int = 20, log_points: Optional[int] = None):
+    """
+    Rescaled Range analysis on a price array.
+    Returns (chunk_sizes, mean_rs_per_size).
+    """
+    log_ret = np.diff(np.log(np.maximum(prices, 1e-12)))
+    n = len(log_ret)
+
+    sizes = _chunk_sizes(n, min_chunk, log_points)
+    if len(sizes) < 3:
+        return [], []
+
+    rs = _rs_matrix(log_ret[None, :], sizes)[0]
+    ok = ~np.isnan(rs)
+    return [s for s, v in zip(sizes, ok) if v], rs[ok].tolist()
+
+
+def hurst_rs(prices: np.ndarray, log_points: Optional[int] = None,
+             clip: Optional[tuple] = None) -> Optional[float]:
+    """
+    Full-period R/S Hurst exponent rounded to 4 places, or None if the series
+    is too short. clip=(lo, hi) bounds H, e.g. for use as a band exponent.
+    """
+    ns, rs = _rs_core(prices, log_points=log_points)
+    if len(ns) < 3:
+        return None
+    H = np.polyfit(np.log(ns), np.log(rs), 1)[0]
+    if clip is not None:
+        H = np.clip(H, *clip)
+    return round(float(H), 4)
+
+
+def _sliding_chunk_rs(log_ret: np.ndarray, size: int, block: int = 1 << 22) -> np.ndarray:
+    """
+    R/S of the chunk log_ret[..., j : j + size] for every offset j, along the
+    last axis. Chunks with zero (or NaN) std are NaN. Offsets are processed in
+    blocks to bound memory.
+    """
+    view = sliding_window_view(log_ret, size, axis=-1)
+    out = np.full(view.shape[:-1], np.nan)
+    rows = max(1, block // (size * view.shape[0]))
+    for lo in range(0, view.shape[1], rows):
+        chunks = view[:, lo : lo + rows]
+        demeaned = chunks - chunks.mean(axis=-1, keepdims=True)
+        dev = np.cumsum(demeaned, axis=-1)
+        R = dev.max(axis=-1) - dev.min(axis=-1)
+        S = np.sqrt((demeaned * demeaned).sum(axis=-1) / (size - 1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:, lo : lo + rows] = np.where(S > 0, R / S, np.nan)
+    return out
+
+
+def _strided_window_sum(x: np.ndarray, size: int, n_chunks: int) -> np.ndarray:
+    """
+    For every start a along the last axis, the sum of x[a], x[a + size], ...,
+    x[a + (n_chunks - 1) * size]. Uses a prefix sum along each residue class
+    mod size, so it is O(len(x)).
+    """
+    k, L = x.shape
+    pad = (-L) % size
+    padded = np.concatenate([x, np.zeros((k, pad))], axis=1)
+    csum = padded.reshape(k, -1, size).cumsum(axis=1).reshape(k, -1)[:, :L]
+    span = (n_chunks - 1) * size
+    n_win = L - span
+    lagged = np.concatenate([np.zeros((k, size)), csum], axis=1)[:, :n_win]
+    return csum[:, span : span + n_win] - lagged
+
+
+def _rolling_block(P: np.ndarray, window: int, sizes: tuple, block: int) -> np.ndarray:
+    """rolling_hurst_all's H[:, window:] for a (rows, n_bars) block."""
+    log_ret = np.diff(np.log(np.maximum(P, 1e-12)), axis=1)
+    n_win = log_ret.shape[1] - window + 1
+    # Running sums of the log-log fit, one per window, accumulated size by size
+    k, sx, sy, sxx, sxy = (np.zeros((P.shape[0], n_win)) for _ in range(5))
+    for size in sizes:
+        rs = _sliding_chunk_rs(log_ret, size, block)
+        ok = ~np.isnan(rs)
+        n_chunks = window // size
+        total = _strided_window_sum(np.where(ok, rs, 0.0), size, n_chunks)[:, :n_win]
+        count = _strided_window_sum(ok.astype(float), size, n_chunks)[:, :n_win]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = np.log(total / count)
+        w = np.isfinite(y)
+        x = np.log(size)
+        y = np.where(w, y, 0.0)
+        k += w
+        sx += w * x
+        sxx += w * (x * x)
+        sy += y
+        sxy += x * y
+
+    # Windows that include a missing price are undefined, not just thinner
+    finite = np.concatenate([np.zeros((P.shape[0], 1)), np.cumsum(np.isfinite(P), axis=1)], axis=1)
+    complete = (finite[:, window + 1 :] - finite[:, : -window - 1]) == window + 1
+    return np.where(complete, _fit_slope(k, sx, sy, sxx, sxy), np.nan)
+
+
+def rolling_hurst_all(prices: np.ndarray, window: int, min_chunk: int = 20,
+                      log_points: Optional[int] = None, block: int = 1 << 20) -> np.ndarray:
+    """
+    H for the trailing window prices[..., i - window : i + 1] at every bar i.
+    Accepts one series or a (n_series, n_bars) matrix and returns an array of
+    the same shape, NaN where H is undefined or the window touches a NaN price.
+
+    Every window has the same length, so the chunk sizes are fixed. The R/S of
+    each chunk is computed once per offset and shared by every window that
+    contains it, and the log-log fit is solved in closed form for all windows.
+    Matches hurst_rs on each window (before rounding).
+
+    Rows are grouped by leading NaN padding (as stack_closes leaves for
+    shorter histories) and run in blocks of about `block` prices, so work and
+    memory follow each series' own length rather than the longest one.
+    """
+    prices = np.asarray(prices, dtype=float)
+    P = np.atleast_2d(prices)
+    H = np.full(P.shape, np.nan)
+    sizes = _chunk_sizes(window, min_chunk, log_points)
+    if len(sizes) < 3 or P.shape[1] <= window:
+        return H.reshape(prices.shape)
+
+    present = np.isfinite(P)
+    first = np.where(present.any(axis=1), present.argmax(axis=1), P.shape[1])
+    for start in np.unique(first):
+        rows = np.flatnonzero(first == start)
+        n = P.shape[1] - start
+        if n <= window:
+            continue
+        step = max(1, block // n)
+        for lo in range(0, len(rows), step):
+            r = rows[lo : lo + step]
+            H[r, start + window :] = _rolling_block(P[r, start:], window, sizes, block)
+    return H.reshape(prices.shape)
+
+
+def rolling_hurst_series(prices: np.ndarray, window: int, step: int = 3):
+    """
+    Rolling H sampled every `step` bars. The cost is that of rolling_hurst_all
+    regardless of step, so step=1 is as cheap as step=3.
+    """
+    H = rolling_hurst_all(prices, window)
+    idxs = np.arange(window, len(H), step)
+    vals = H[idxs]
+    keep = ~np.isnan(vals)
+    return idxs[keep].tolist(), np.round(vals[keep], 4).tolist()
+
+
+def stack_closes(series: list):
+    """
+    Right-align price arrays of different lengths into a (n_series, n_bars)
+    matrix. Returns (prices, mask) with mask True where a price is present.
+    """
+    n_bars = max(len(s) for s in series)
+    prices = np.full((len(series), n_bars), np.nan)
+    mask = np.zeros((len(series), n_bars), dtype=bool)
+    for r, s in enumerate(series):
+        prices[r, n_bars - len(s) :] = s
+        mask[r, n_bars - len(s) :] = True
+    return prices, mask
+
+
+def _segments(prices: np.ndarray, mask: np.ndarray):
+    """
+    Group the rows of a ragged (n_series, n_bars) matrix by history length.
+    Yields (row_indices, (n_rows, length) matrix of the present bars).
+    """
+    lengths = mask.sum(axis=1)
+    first = mask.argmax(axis=1)
+    for r in range(len(mask)):
+        if not mask[r, first[r] : first[r] + lengths[r]].all():
+            raise ValueError(f"row {r}: mask must be one contiguous run of bars")
+    for n in np.unique(lengths):
+        rows = np.flatnonzero(lengths == n)
+        yield rows, prices[rows[:, None], first[rows][:, None] + np.arange(n)]
+
+
+def hurst_batch(prices: np.ndarray, mask: Optional[np.ndarray] = None,
+                window: Optional[int] = None, min_chunk: int = 20,
+                log_points: Optional[int] = None) -> dict:
+    """
+    Full-period R/S and (optionally) rolling H for many series at once.
+
+    prices is (n_series, n_bars); mask marks present bars and must be one
+    contiguous run per row (ragged histories), defaulting to ~isnan(prices).
+    Series of equal length share one vectorized R/S pass.
+
+    Returns {"H": (n_series,) rounded like hurst_rs, NaN if undefined,
+             "ns": [chunk sizes per series], "rs": [mean R/S per series],
+             "rolling": (n_series, n_bars) or None,
+             "passes": number of series given a full R/S curve}.
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=float))
+    if mask is None:
+        mask = ~np.isnan(prices)
+    mask = np.asarray(mask, dtype=bool)
+    prices = np.where(mask, prices, np.nan)
+
+    n_series = prices.shape[0]
+    H = np.full(n_series, np.nan)
+    ns = [[] for _ in range(n_series)]
+    rs = [[] for _ in range(n_series)]
+    passes = 0
+    for rows, seg in _segments(prices, mask):
+        sizes = _chunk_sizes(seg.shape[1] - 1, min_chunk, log_points)
+        if len(sizes) < 3:
+            continue
+        log_ret = np.diff(np.log(np.maximum(seg, 1e-12)), axis=1)
+        rs_mat = _rs_matrix(log_ret, sizes)
+        passes += len(rs_mat)
+        with np.errstate(divide="ignore"):
+            H[rows] = np.round(_loglog_slope(sizes, np.log(rs_mat)), 4)
+        for r, row in zip(rows, rs_mat):
+            ok = ~np.isnan(row)
+            ns[r] = [s for s, v in zip(sizes, ok) if v]
+            rs[r] = row[ok].tolist()
+
+    rolling = rolling_hurst_all(prices, window, min_chunk, log_points) if window else None
+    return {"H": H, "ns": ns, "rs": rs, "rolling": rolling, "passes": passes}
+
+
+def rs_fit(ns: list, rs: list) -> dict:
+    """
+    Log-log fit of an R/S curve: slope (= H), intercept, fitted curve and a
+    slope-0.5 random-walk reference through the same mid-point.
+    Returns {} if there are fewer than three points.
+    """
+    if len(ns) < 3:
+        return {}
+    log_n = np.log(ns)
+    log_rs = np.log(rs)
+    slope, intercept = np.polyfit(log_n, log_rs, 1)
+    intercept_rw = np.mean(log_rs) - 0.5 * np.mean(log_n)
+    return {
+        "ns": ns,
+        "rs": rs,
+        "H": round(float(slope), 4),
+        "slope": float(slope),
+        "intercept": float(intercept),
+        "fitted": np.exp(slope * log_n + intercept).tolist(),
+        "rw_ref": np.exp(0.5 * log_n + intercept_rw).tolist(),
+    }
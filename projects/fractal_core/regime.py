@@ -0,0 +1,13 @@
+"""Hurst regime classification."""
+
+# H below the first bound is mean-reverting, above the second persistent
+REGIME_BOUNDS = (0.45, 0.55)
+
+
+def classify_regime(H: float) -> str:
+    """One of "Mean-Reverting", "Random Walk", "Persistent"."""
+    if H < REGIME_BOUNDS[0]:
+        return "Mean-Reverting"
+    if H < REGIME_BOUNDS[1]:
+        return "Random Walk"
+    return "Persistent"
@@ -0,0 +1,121 @@
+"""
+Multi-ticker fractal range screener over the local price store.
+
+Each ticker's H, Trade/Trend/Tail bands and current signals are computed in
+a worker process from its stored history; nothing is fetched here, so top
+up the store first (load_history) for fresh results.
+
+    python -m fractal_core.screener SPY QQQ AAPL --period 5y
+    python -m fractal_core.screener --file sp500.txt --h-window 252 --out scan.csv
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Optional
+
+import pandas as pd
+
+from .bands import H_CLIP, TIMEFRAMES, compute_ranges, get_signal
+from .hurst import hurst_rs
+from .regime import classify_regime
+from .store import read_history, slice_period
+
+# Tickers per worker task: enough to amortize process hand-off, small enough
+# to keep every worker busy on a few hundred symbols
+SCREEN_CHUNK = 16
+
+
+def screen_ticker(ticker: str, period: str = "5y", h_window: Optional[int] = None) -> Optional[dict]:
+    """
+    One screener row for ticker from its stored history, or None if it isn't
+    stored or is too short to fill the Tail band. h_window=None fits H over
+    the whole period; otherwise H is the trailing h_window-bar estimate at
+    the last bar.
+    """
+    df = slice_period(read_history(ticker, ["Close"]), period).dropna()
+    close = df["Close"].values
+    if len(close) <= max(cfg["window"] for cfg in TIMEFRAMES.values()):
+        return None
+    H = hurst_rs(close if h_window is None else close[-(h_window + 1):], clip=H_CLIP)
+    if H is None:
+        return None
+
+    last = compute_ranges(df, H).iloc[-1]
+    close_now = close[-1]
+    row = {"Ticker": ticker, "Close": close_now, "H": H, "Regime": classify_regime(H),
+           "Last Bar": df.index[-1].date()}
+    for name, cfg in TIMEFRAMES.items():
+        upper, lower = last[f"{name}_upper"], last[f"{name}_lower"]
+        row[cfg["label"]] = get_signal(close_now, upper, lower, last[f"{name}_ma"])
+        row[f"{cfg['label']} to Support %"] = (close_now - lower) / close_now * 100
+        row[f"{cfg['label']} to Resist. %"] = (upper - close_now) / close_now * 100
+    return row
+
+
+def _screen_chunk(tickers: list, period: str, h_window: Optional[int]) -> list:
+    return [screen_ticker(t, period, h_window) for t in tickers]
+
+
+def screen(tickers: list, period: str = "5y", h_window: Optional[int] = None,
+           workers: Optional[int] = None, progress=None, pool: Optional[Executor] = None) -> pd.DataFrame:
+    """
+    Screener table for tickers, one row per ticker found in the store, in
+    input order. Work is split into SCREEN_CHUNK-ticker tasks on a process
+    pool (workers=1 runs inline); pass pool to reuse a long-lived executor
+    instead of starting one per call. progress(done, total) is called as
+    tasks finish. Missing or short tickers are listed in df.attrs["skipped"].
+    """
+    tickers = list(dict.fromkeys(tickers))
+    chunks = [tickers[i:i + SCREEN_CHUNK] for i in range(0, len(tickers), SCREEN_CHUNK)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    rows = []
+    if pool is None and workers <= 1:
+        results = (_screen_chunk(c, period, h_window) for c in chunks)
+        for i, chunk_rows in enumerate(results):
+            rows.extend(chunk_rows)
+            if progress:
+                progress(min((i + 1) * SCREEN_CHUNK, len(tickers)), len(tickers))
+    else:
+        with nullcontext(pool) if pool is not None else ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_screen_chunk, c, period, h_window) for c in chunks]
+            for i, fut in enumerate(futures):
+                rows.extend(fut.result())
+                if progress:
+                    progress(min((i + 1) * SCREEN_CHUNK, len(tickers)), len(tickers))
+
+    out = pd.DataFrame([r for r in rows if r is not None])
+    out.attrs["skipped"] = [t for t, r in zip(tickers, rows) if r is None]
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tickers", nargs="*")
+    ap.add_argument("--file", help="file of tickers, whitespace or comma separated")
+    ap.add_argument("--period", default="5y")
+    ap.add_argument("--h-window", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", help="write CSV here instead of printing")
+    args = ap.parse_args(argv)
+
+    tickers = [t.upper() for t in args.tickers]
+    if args.file:
+        with open(args.file) as f:
+            tickers += [t.strip().upper() for t in f.read().replace(",", " ").split() if t.strip()]
+    if not tickers:
+        ap.error("no tickers given")
+
+    table = screen(tickers, args.period, args.h_window, args.workers)
+    if table.attrs["skipped"]:
+        print(f"skipped (not stored or too short): {' '.join(table.attrs['skipped'])}", file=sys.stderr)
+    if args.out:
+        table.to_csv(args.out, index=False, float_format="%.4f")
+    elif not table.empty:
+        print(table.round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Local price store: full daily OHLCV history per ticker in Parquet.
+
+Each request only asks yfinance for bars after the last stored date; any
+period is served as a local slice. top_up_many refreshes a whole watch list
+with one yfinance request per batch of tickers.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from shared_core import TokenBucket
+
+PRICE_STORE_DIR = Path(os.environ.get("PRICE_STORE_DIR", Path.home() / ".cache" / "fractal-markets" / "prices"))
+STORE_REFRESH_SECS = 3600
+# Tickers per batched yfinance download in top_up_many
+STORE_BATCH = 100
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _store_path(ticker: str) -> Path:
+    return PRICE_STORE_DIR / f"{ticker.replace('/', '_')}.parquet"
+
+
+def _download(ticker: str, limiter: Optional[TokenBucket] = None, **kwargs) -> pd.DataFrame:
+    import yfinance as yf  # deferred: slow to import and only needed on a miss
+
+    if limiter is not None:
+        limiter.acquire()
+    df = yf.Ticker(ticker).history(**kwargs)
+    if df.empty:
+        return pd.DataFrame(columns=OHLCV)
+    return df[OHLCV].dropna()
+
+
+def _download_many(tickers: list, limiter: Optional[TokenBucket] = None, **kwargs) -> dict:
+    """{ticker: OHLCV frame} from one yfinance download; empty frames for misses."""
+    import yfinance as yf
+
+    if limiter is not None:
+        limiter.acquire()
+    raw = yf.download(tickers, group_by="ticker", auto_adjust=True, actions=False, ignore_tz=False,
+                      threads=True, progress=False, **kwargs)
+    have = set(raw.columns.get_level_values(0)) if not raw.empty else set()
+    return {t: raw[t][OHLCV].dropna() if t in have else pd.DataFrame(columns=OHLCV) for t in tickers}
+
+
+def _write(path: Path, df: pd.DataFrame):
+    PRICE_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    # A temp name per writer: concurrent sessions may refresh the same ticker
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _merge(df: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """df with new's bars appended; a re-quoted bar replaces the stored one."""
+    df = pd.concat([df, new])
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def _anchor(df: pd.DataFrame) -> pd.Timestamp:
+    """
+    The last stored bar known to be complete. The final row may be a session
+    still forming when it was written, so its close is expected to move.
+    """
+    return df.index[-2] if len(df) > 1 else df.index[-1]
+
+
+def _restale(df: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """True if new re-quotes df's anchor bar at a different close (a split or dividend re-adjustment)."""
+    ref = _anchor(df)
+    return ref in new.index and not np.isclose(new.at[ref, "Close"], df.at[ref, "Close"], rtol=1e-6)
+
+
+def load_history(ticker: str, limiter: Optional[TokenBucket] = None) -> pd.DataFrame:
+    """
+    Full OHLCV history for ticker, read from the local store and topped up
+    with any newer bars. Skips the network if the file was refreshed within
+    STORE_REFRESH_SECS. If a top-up fails the stored history is served as is
+    and left unwritten, so the next call retries. Each yfinance request
+    first takes a limiter token.
+    """
+    path = _store_path(ticker)
+    if path.exists():
+        df = pd.read_parquet(path)
+        if time.time() - path.stat().st_mtime < STORE_REFRESH_SECS:
+            return df
+        try:
+            # Re-request from the last completed bar: if its close moved, a
+            # split or dividend re-adjusted the history and the stored copy is
+            # stale. A forming bar after it is simply overwritten by the merge.
+            new = _download(ticker, limiter, start=_anchor(df).strftime("%Y-%m-%d"))
+            restaled = _restale(df, new)
+            if restaled:
+                new = _download(ticker, limiter, period="max")
+        except Exception:
+            return df
+        # The request covers a stored bar, so an empty answer is a failed
+        # download (yfinance logs errors and returns nothing)
+        if new.empty:
+            return df
+        df = new if restaled else _merge(df, new)
+    else:
+        df = _download(ticker, limiter, period="max")
+        if df.empty:
+            return df
+
+    _write(path, df)
+    return df
+
+
+def _as_tz(df: pd.DataFrame, tz) -> pd.DataFrame:
+    """df re-indexed into the stored history's time zone (batched downloads may differ)."""
+    if df.empty or df.index.tz == tz:
+        return df
+    if df.index.tz is None:
+        return df.tz_localize(tz)
+    return df.tz_convert(tz) if tz is not None else df.tz_localize(None)
+
+
+def top_up_many(tickers: list, limiter: Optional[TokenBucket] = None, batch: int = STORE_BATCH) -> list:
+    """
+    load_history for a watch list, with one yfinance request per batch of
+    tickers instead of one per ticker. Frames are written back to the store
+    and dropped, so memory is bounded by one batch. Stale tickers are topped
+    up from the earliest last completed bar in their batch; tickers not yet
+    stored, or whose history was re-adjusted, are fetched in full. A stored
+    ticker the download returned nothing for is left unwritten, so the next
+    call retries it. Returns the tickers yfinance had no data for.
+    """
+    now = time.time()
+    stale, full = [], []
+    for t in dict.fromkeys(tickers):
+        path = _store_path(t)
+        if not path.exists():
+            full.append(t)
+        elif now - path.stat().st_mtime >= STORE_REFRESH_SECS:
+            stale.append(t)
+
+    for i in range(0, len(stale), batch):
+        chunk = stale[i:i + batch]
+        stored = {t: pd.read_parquet(_store_path(t)) for t in chunk}
+        start = min(_anchor(df).tz_localize(None) for df in stored.values())
+        new = _download_many(chunk, limiter, start=start.strftime("%Y-%m-%d"))
+        for t, df in stored.items():
+            fresh = _as_tz(new[t], df.index.tz)
+            if fresh.empty:
+                continue   # failed: every request covers a stored bar (see load_history)
+            if _restale(df, fresh):
+                full.append(t)
+                continue
+            _write(_store_path(t), _merge(df, fresh))
+
+    empty = []
+    for i in range(0, len(full), batch):
+        chunk = full[i:i + batch]
+        for t, df in _download_many(chunk, limiter, period="max").items():
+            if df.empty:
+                empty.append(t)
+            else:
+                _write(_store_path(t), df)
+    return empty
+
+
+def read_history(ticker: str, columns: Optional[list] = None) -> pd.DataFrame:
+    """Stored history for ticker without touching the network; empty if not stored."""
+    path = _store_path(ticker)
+    if not path.exists():
+        return pd.DataFrame(columns=columns or OHLCV)
+    return pd.read_parquet(path, columns=columns)
+
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Trailing slice of a history for a yfinance-style period ("2y", "max")."""
+    if period == "max" or df.empty:
+        return df
+    start = df.index[-1] - pd.DateOffset(years=int(period.rstrip("y")))
+    return df[df.index >= start]
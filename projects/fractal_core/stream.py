@@ -0,0 +1,231 @@
+"""
+Streaming Trade/Trend/Tail bands: O(1) work per new bar.
+
+BandStream keeps running sums of close and log return for each horizon, so
+appending a bar updates every band and signal without touching the
+history. Signal changes are published to subscribers as event dicts. Bars
+come from any iterable feed of (timestamp, close); ReplayFeed plays back a
+local CSV/Parquet file and stands in for a live feed.
+
+    python -m fractal_core.stream bars.csv --H 0.58 --horizon tail --breakouts
+    python -m fractal_core.stream bars.parquet --ticker SPY --interval 5m --speed 60
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .bands import BARS_PER_DAY, H_CLIP, TIMEFRAMES, bar_windows, get_signal
+
+
+class RollingMoments:
+    """
+    Trailing-n sum and sum of squares of a series, updated in O(1). Values
+    are stored relative to a shift, and the sums are rebuilt from the buffer
+    (re-centred on the window mean) every n pushes, which bounds float drift
+    at O(1) amortized cost.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.buf = [0.0] * n
+        self.i = 0
+        self.count = 0
+        self.shift = None
+        self.s1 = self.s2 = 0.0
+        self.since_resum = 0
+
+    def push(self, x: float):
+        if self.shift is None:
+            self.shift = x
+        d = x - self.shift
+        if self.count == self.n:
+            old = self.buf[self.i]
+            self.s1 -= old
+            self.s2 -= old * old
+        else:
+            self.count += 1
+        self.buf[self.i] = d
+        self.s1 += d
+        self.s2 += d * d
+        self.i = (self.i + 1) % self.n
+
+        self.since_resum += 1
+        if self.since_resum >= self.n:
+            m = math.fsum(self.buf) / self.n
+            self.buf = [v - m for v in self.buf]
+            self.shift += m
+            self.s1 = math.fsum(self.buf)
+            self.s2 = math.fsum(v * v for v in self.buf)
+            self.since_resum = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.n
+
+    @property
+    def mean(self) -> float:
+        return self.shift + self.s1 / self.n if self.full else math.nan
+
+    @property
+    def var(self) -> float:
+        """Sample variance (ddof=1) of the window, NaN until it is full."""
+        if not self.full:
+            return math.nan
+        return max(self.s2 - self.s1 * self.s1 / self.n, 0.0) / max(self.n - 1, 1)
+
+
+class BandStream:
+    """
+    Live Trade/Trend/Tail bands and signals for one series. update() takes
+    one bar's close and returns (and publishes) an event per horizon whose
+    signal changed:
+
+        {"ts", "horizon", "signal", "previous", "close", "upper", "lower", "ma", "H"}
+
+    H is the band exponent and may be reassigned between bars.
+    """
+
+    def __init__(self, H: float, bars_per_year: int = 252):
+        self.H = H
+        self.bars_per_year = bars_per_year
+        self.windows = bar_windows(bars_per_year)
+        self._close = {name: RollingMoments(N) for name, N in self.windows.items()}
+        self._ret = {name: RollingMoments(N) for name, N in self.windows.items()}
+        self.prev_close = None
+        self.signals = {name: "NO DATA" for name in self.windows}
+        self.levels = {name: (math.nan, math.nan, math.nan) for name in self.windows}
+        self.bars = 0
+        self._subscribers = []
+
+    def subscribe(self, fn):
+        """Call fn(event) for every signal change."""
+        self._subscribers.append(fn)
+
+    def seed(self, closes):
+        """Warm the windows from history without publishing events."""
+        for c in np.asarray(closes, dtype=float):
+            self._advance(None, float(c))
+
+    def update(self, ts, close: float) -> list:
+        events = self._advance(ts, float(close))
+        for ev in events:
+            for fn in self._subscribers:
+                fn(ev)
+        return events
+
+    def _advance(self, ts, close: float) -> list:
+        if not math.isfinite(close) or close <= 0:
+            return []
+        if self.prev_close is not None:
+            r = math.log(close / self.prev_close)
+            for w in self._ret.values():
+                w.push(r)
+        for w in self._close.values():
+            w.push(close)
+        self.prev_close = close
+        self.bars += 1
+
+        events = []
+        for name, N in self.windows.items():
+            ma = self._close[name].mean
+            sigma = (math.sqrt(self._ret[name].var) * math.sqrt(self.bars_per_year) * close
+                     * (N / self.bars_per_year) ** self.H)
+            upper, lower = ma + sigma, ma - sigma
+            self.levels[name] = (upper, lower, ma)
+            signal = get_signal(close, upper, lower, ma)
+            if signal != self.signals[name] and ts is not None:
+                events.append({
+                    "ts": str(ts), "horizon": name, "signal": signal, "previous": self.signals[name],
+                    "close": close, "upper": upper, "lower": lower, "ma": ma, "H": self.H,
+                })
+            self.signals[name] = signal
+        return events
+
+
+# ── Feeds ─────────────────────────────────────────────────────────────────────
+class ReplayFeed:
+    """
+    Bars from a local file: CSV or Parquet with a timestamp index (or first
+    column) and a Close column. speed=0 replays as fast as possible; speed=k
+    sleeps between bars for their real spacing divided by k.
+    """
+
+    def __init__(self, source, speed: float = 0.0, start: int = 0):
+        if isinstance(source, pd.DataFrame):
+            df = source
+        elif Path(source).suffix == ".parquet":
+            df = pd.read_parquet(source)
+        else:
+            df = pd.read_csv(source, index_col=0)
+        self.index = pd.to_datetime(df.index)
+        self.close = df["Close"].to_numpy(dtype=float)
+        self.speed = speed
+        self.start = start
+
+    def __len__(self):
+        return len(self.close) - self.start
+
+    def __iter__(self):
+        prev = None
+        for i in range(self.start, len(self.close)):
+            ts = self.index[i]
+            if self.speed and prev is not None:
+                time.sleep(max((ts - prev).total_seconds(), 0) / self.speed)
+            prev = ts
+            yield ts, self.close[i]
+
+
+def run(stream: BandStream, feed):
+    """Push every bar of feed through stream, yielding events as they fire."""
+    for ts, close in feed:
+        yield from stream.update(ts, close)
+
+
+def main(argv=None):
+    from .hurst import hurst_rs
+    from .store import read_history
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("replay", help="CSV or Parquet of bars with a Close column")
+    ap.add_argument("--H", type=float, default=None, help="band exponent (default: fitted, see --ticker)")
+    ap.add_argument("--ticker", help="fit H on this ticker's stored daily history")
+    ap.add_argument("--interval", default="1d", choices=["1d", "1h", "5m", "1m"])
+    ap.add_argument("--warmup", type=int, default=None,
+                    help="bars from the file used to seed the windows (default: the Tail window + 1)")
+    ap.add_argument("--speed", type=float, default=0.0)
+    ap.add_argument("--horizon", choices=list(TIMEFRAMES), action="append",
+                    help="only report these horizons (repeatable)")
+    ap.add_argument("--breakouts", action="store_true", help="only report moves into a breakout or breakdown")
+    args = ap.parse_args(argv)
+
+    bars_per_year = 252 * BARS_PER_DAY[args.interval]
+    feed = ReplayFeed(args.replay, args.speed)
+
+    H: Optional[float] = args.H
+    if H is None and args.ticker:
+        H = hurst_rs(read_history(args.ticker, ["Close"])["Close"].dropna().values, clip=H_CLIP)
+    if H is None:
+        H = hurst_rs(feed.close, clip=H_CLIP) or 0.5
+        print(f"H fitted on the replay file: {H:.4f} (look-ahead; pass --H or --ticker)", file=sys.stderr)
+
+    stream = BandStream(H, bars_per_year)
+    warmup = args.warmup if args.warmup is not None else max(stream.windows.values()) + 1
+    stream.seed(feed.close[:warmup])
+    feed.start = warmup
+
+    for ev in run(stream, feed):
+        if args.horizon and ev["horizon"] not in args.horizon:
+            continue
+        if not args.breakouts or ev["signal"] in ("BULLISH BREAKOUT", "BEARISH BREAKDOWN"):
+            print(json.dumps(ev), flush=True)
+
+
+if __name__ == "__main__":
+    main()
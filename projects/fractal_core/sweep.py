@@ -0,0 +1,254 @@
+"""
+Parameter sweep over band window triplets and exponent sources.
+
+Every grid point (trade, trend, tail windows x exponent source) is scored
+per ticker by backtesting the equal-weight blend of its three horizon
+positions. Prices come from the local store and are placed once in shared
+memory; worker processes attach to it, so a task only carries a row index.
+Scores are cached per ticker and keyed by a fingerprint of the price data,
+so re-running a sweep only computes grid points it hasn't seen.
+
+    python -m fractal_core.sweep --file sp500.txt --period 10y --top 15
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtest import backtest_positions, band_positions
+from .bands import H_CLIP, band_levels, band_parts, classify_signals, rolling_band_h
+from .hurst import hurst_rs, stack_closes
+from .store import read_history, slice_period
+
+SWEEP_CACHE_DIR = Path(os.environ.get("SWEEP_CACHE_DIR", Path.home() / ".cache" / "fractal-markets" / "sweeps"))
+
+# "fixed": one H fitted on the ticker's whole period; "rolling": trailing
+# h_window-bar H per bar (no look-ahead); "classical": 0.5, i.e. sqrt(T)
+EXPONENT_SOURCES = ("fixed", "rolling", "classical")
+
+KEY = ["trade", "trend", "tail", "exponent", "h_window", "cost_bps", "long_only"]
+METRICS = ["total_return", "cagr", "max_drawdown", "hit_rate", "trades", "turnover", "exposure"]
+
+
+def window_grid(trade=(10, 21, 42), trend=(42, 63, 126), tail=(126, 252, 504)) -> list:
+    """Window triplets from the product of the candidates, keeping trade < trend < tail."""
+    return [t for t in itertools.product(trade, trend, tail) if t[0] < t[1] < t[2]]
+
+
+# ── Scoring ───────────────────────────────────────────────────────────────────
+def _exponent(close: np.ndarray, source: str, h_window: int):
+    if source == "fixed":
+        H = hurst_rs(close, clip=H_CLIP)
+        return 0.5 if H is None else H
+    if source == "rolling":
+        return rolling_band_h(close, h_window)
+    return 0.5
+
+
+def score_grid(close: np.ndarray, points: list, h_window: int = 252, cost_bps: float = 5.0,
+               long_only: bool = False) -> list:
+    """
+    Backtest metrics for each (trade, trend, tail, source) point on one price
+    series. Band intermediates are built once for every window in the grid
+    and each window's positions once per source, then all triplets of a
+    source are backtested together. Returns one dict per point.
+    """
+    close = np.asarray(close, dtype=float)
+    parts = band_parts(close, sorted({N for p in points for N in p[:3]}))
+    rows = []
+    for source in dict.fromkeys(p[3] for p in points):
+        triplets = [p[:3] for p in points if p[3] == source]
+        exponent = _exponent(close, source, h_window)
+        positions = {}
+        for N in sorted({N for t in triplets for N in t}):
+            upper, lower, ma = band_levels(parts, N, exponent)
+            positions[N] = band_positions(classify_signals(close, upper, lower, ma), long_only)
+        blend = np.stack([(positions[a] + positions[b] + positions[c]) / 3 for a, b, c in triplets], axis=1)
+        stats = backtest_positions(close, blend, cost_bps)
+        for j, (a, b, c) in enumerate(triplets):
+            rows.append({
+                "trade": a, "trend": b, "tail": c, "exponent": source,
+                "h_window": h_window if source == "rolling" else 0,
+                "cost_bps": float(cost_bps), "long_only": bool(long_only),
+                **{m: float(stats[m][j]) for m in METRICS},
+            })
+    return rows
+
+
+# ── Shared-memory workers ─────────────────────────────────────────────────────
+_SHARED = {}
+
+
+def _attach(name: str, shape: tuple):
+    shm = shared_memory.SharedMemory(name=name)
+    _SHARED["shm"] = shm  # keep the mapping alive for the worker's lifetime
+    _SHARED["prices"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _score_row(row: int, length: int, points: list, h_window: int, cost_bps: float, long_only: bool) -> list:
+    close = _SHARED["prices"][row, -length:]
+    return score_grid(close, points, h_window, cost_bps, long_only)
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+def _cache_path(ticker: str) -> Path:
+    return SWEEP_CACHE_DIR / f"{ticker.replace('/', '_')}.parquet"
+
+
+def _fingerprint(close: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(close).tobytes()).hexdigest()[:16]
+
+
+def _read_cache(ticker: str, fingerprint: str) -> pd.DataFrame:
+    path = _cache_path(ticker)
+    if not path.exists():
+        return pd.DataFrame(columns=KEY + METRICS)
+    df = pd.read_parquet(path)
+    return df[df["fingerprint"] == fingerprint].drop(columns=["ticker", "fingerprint"])
+
+
+def _write_cache(ticker: str, fingerprint: str, rows: pd.DataFrame):
+    """Replace the ticker's cache with rows; entries for older data are dropped."""
+    SWEEP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _cache_path(ticker)
+    # A temp name per writer: concurrent sweeps may cache the same ticker
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        rows.assign(ticker=ticker, fingerprint=fingerprint).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# ── Sweep ─────────────────────────────────────────────────────────────────────
+def sweep(tickers: list, grid: Optional[list] = None, sources=EXPONENT_SOURCES, period: str = "10y",
+          h_window: int = 252, cost_bps: float = 5.0, long_only: bool = False,
+          workers: Optional[int] = None, use_cache: bool = True, progress=None) -> pd.DataFrame:
+    """
+    Score every (window triplet, exponent source) on every stored ticker.
+    Returns one row per ticker and grid point with the backtest metrics.
+    Cached points are reused; only missing ones are computed, one task per
+    ticker on a process pool sized to every core by default. progress(done,
+    total) is called as tickers finish. Tickers that aren't stored or are
+    too short for the longest window are listed in df.attrs["skipped"].
+    """
+    grid = grid or window_grid()
+    points = [(*t, s) for t in grid for s in sources]
+    need_bars = max(t[2] for t in grid) + 2
+    # Full cache key of each point, in KEY order
+    key = {p: (*p, h_window if p[3] == "rolling" else 0, float(cost_bps), bool(long_only)) for p in points}
+
+    closes, prints, cached, todo, skipped = {}, {}, {}, {}, []
+    for t in dict.fromkeys(tickers):
+        close = slice_period(read_history(t, ["Close"]), period)["Close"].dropna().values
+        if len(close) < need_bars:
+            skipped.append(t)
+            continue
+        closes[t], prints[t] = close, _fingerprint(close)
+        have = _read_cache(t, prints[t]) if use_cache else pd.DataFrame(columns=KEY + METRICS)
+        cached[t] = have
+        seen = set(have[KEY].itertuples(index=False, name=None))
+        missing = [p for p in points if key[p] not in seen]
+        if missing:
+            todo[t] = missing
+
+    new = {}
+    done = len(closes) - len(todo)
+    if progress and closes:
+        progress(done, len(closes))
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers <= 1:
+        for t, missing in todo.items():
+            new[t] = score_grid(closes[t], missing, h_window, cost_bps, long_only)
+            done += 1
+            if progress:
+                progress(done, len(closes))
+    elif todo:
+        names = list(todo)
+        prices, _ = stack_closes([closes[t] for t in names])
+        shm = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+        try:
+            np.ndarray(prices.shape, dtype=np.float64, buffer=shm.buf)[:] = prices
+            del prices
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(shm.name, (len(names), max(len(closes[t]) for t in names)))) as pool:
+                futures = {pool.submit(_score_row, r, len(closes[t]), todo[t], h_window, cost_bps, long_only): t
+                           for r, t in enumerate(names)}
+                for fut in as_completed(futures):
+                    new[futures[fut]] = fut.result()
+                    done += 1
+                    if progress:
+                        progress(done, len(closes))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    wanted = set(key.values())
+    frames = []
+    for t in closes:
+        rows = cached[t]
+        if t in new:
+            rows = pd.concat([rows, pd.DataFrame(new[t])], ignore_index=True) if len(rows) else pd.DataFrame(new[t])
+            if use_cache:
+                _write_cache(t, prints[t], rows)
+        keep = [k in wanted for k in rows[KEY].itertuples(index=False, name=None)]
+        frames.append(rows[keep].assign(ticker=t))
+
+    out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["ticker"] + KEY + METRICS)
+    out = out[["ticker"] + KEY + METRICS]
+    out.attrs["skipped"] = skipped
+    return out
+
+
+def summarize(results: pd.DataFrame, by: str = "cagr") -> pd.DataFrame:
+    """Mean metrics per grid point across tickers, best `by` first."""
+    grouped = results.groupby(["trade", "trend", "tail", "exponent"])
+    table = grouped[METRICS].mean()
+    table.insert(0, "tickers", grouped.size())
+    return table.sort_values(by, ascending=False).reset_index()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tickers", nargs="*")
+    ap.add_argument("--file", help="file of tickers, whitespace or comma separated")
+    ap.add_argument("--period", default="10y")
+    ap.add_argument("--h-window", type=int, default=252)
+    ap.add_argument("--cost-bps", type=float, default=5.0)
+    ap.add_argument("--long-only", action="store_true")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--out", help="write per-ticker results as CSV")
+    args = ap.parse_args(argv)
+
+    tickers = [t.upper() for t in args.tickers]
+    if args.file:
+        with open(args.file) as f:
+            tickers += [t.strip().upper() for t in f.read().replace(",", " ").split() if t.strip()]
+    if not tickers:
+        ap.error("no tickers given")
+
+    results = sweep(tickers, period=args.period, h_window=args.h_window, cost_bps=args.cost_bps,
+                    long_only=args.long_only, workers=args.workers, use_cache=not args.no_cache)
+    if results.attrs["skipped"]:
+        print(f"skipped (not stored or too short): {' '.join(results.attrs['skipped'])}", file=sys.stderr)
+    if args.out:
+        results.to_csv(args.out, index=False, float_format="%.6f")
+    if not results.empty:
+        print(summarize(results).head(args.top).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import streamlit as st
-import yfinance as yf
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import time
-from typing import Optional
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fractal_core import (
+    HURST_ESTIMATORS, RS_LOG_POINTS, TokenBucket, classify_regime, estimate_hurst_batch,
+    hurst_batch, load_history, rolling_hurst, rs_fit, slice_period, stack_closes,
+)
 
 st.set_page_config(
     page_title="Fractal Markets — Hurst Exponent",
@@ -220,102 +227,98 @@ LAYOUT = dict(
 
 PALETTE = ["#00D4AA", "#E05C6A", "#E8A030", "#7B9FD4", "#C87FD4", "#6BCFB8"]
 
+MAX_TICKERS = 500
+CARDS_PER_ROW = 5
 
-# ── Hurst R/S implementation ──────────────────────────────────────────────────
-def _rs_core(prices: np.ndarray, min_chunk: int = 20):
-    """
-    Rescaled Range analysis on a price array.
-    Returns (chunk_sizes, mean_rs_per_size).
-    """
-    log_ret = np.diff(np.log(np.maximum(prices, 1e-12)))
-    n = len(log_ret)
-
-    # Generate chunk sizes: n//2, n//3, ... down to min_chunk
-    sizes = sorted(set(n // k for k in range(2, n + 1) if n // k >= min_chunk))
-    if len(sizes) < 3:
-        return [], []
-
-    ns, rs_means = [], []
-    for size in sizes:
-        rs_list = []
-        for start in range(0, n - size + 1, size):
-            chunk = log_ret[start : start + size]
-            dev = np.cumsum(chunk - chunk.mean())
-            R = dev.max() - dev.min()
-            S = chunk.std(ddof=1)
-            if S > 0:
-                rs_list.append(R / S)
-        if rs_list:
-            ns.append(size)
-            rs_means.append(float(np.mean(rs_list)))
-
-    return ns, rs_means
-
-
-def hurst_rs(prices: np.ndarray) -> Optional[float]:
-    ns, rs = _rs_core(prices)
-    if len(ns) < 3:
-        return None
-    H = np.polyfit(np.log(ns), np.log(rs), 1)[0]
-    return round(float(H), 4)
-
-
-def rolling_hurst_series(prices: np.ndarray, window: int, step: int = 3):
-    idxs, vals = [], []
-    for i in range(window, len(prices), step):
-        H = hurst_rs(prices[i - window : i + 1])
-        if H is not None:
-            idxs.append(i)
-            vals.append(H)
-    return idxs, vals
+
+# ── Fetch concurrency ─────────────────────────────────────────────────────────
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", 8))
+FETCH_RATE = float(os.environ.get("FETCH_RATE", 5))  # yfinance requests per second
+
+
+@st.cache_resource
+def fetch_limiter() -> TokenBucket:
+    """One limiter per server process, shared by every session and worker thread."""
+    return TokenBucket(FETCH_RATE)
 
 
 # ── Cached data layer ─────────────────────────────────────────────────────────
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_prices(ticker: str, period: str) -> pd.DataFrame:
-    df = yf.Ticker(ticker).history(period=period)[["Close"]].dropna()
+    df = slice_period(load_history(ticker, fetch_limiter()), period)[["Close"]].dropna()
     return df
 
 
+def fetch_all(tickers: list, period: str, workers: int = FETCH_WORKERS):
+    """
+    Fetch tickers on a bounded thread pool. Yields (ticker, df, error) as each
+    completes, so wall time tracks the slowest ticker rather than the sum.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tickers)))) as pool:
+        futures = {pool.submit(fetch_prices, t, period): t for t in tickers}
+        for fut in as_completed(futures):
+            try:
+                yield futures[fut], fut.result(), None
+            except Exception as e:
+                yield futures[fut], None, e
+
+
+# R/S estimators and the chunk-size grid each fits over (None = full grid)
+RS_GRIDS = {"R/S": None, "R/S (log grid)": RS_LOG_POINTS}
+
+
 @st.cache_data(ttl=3600, show_spinner=False)
-def get_hurst_full(ticker: str, period: str) -> Optional[float]:
-    df = fetch_prices(ticker, period)
-    return hurst_rs(df["Close"].values)
+def get_rs_results(tickers: tuple, period: str, log_points=None) -> tuple:
+    """
+    One R/S pass per ticker, shared by the H cards, the R/S tab and the
+    summary. Returns ({ticker: rs_fit(...)} ({} where the history is too
+    short), number of R/S passes run to compute it).
+    """
+    frames = [fetch_prices(t, period) for t in tickers]
+    prices, mask = stack_closes([df["Close"].values for df in frames])
+    res = hurst_batch(prices, mask, log_points=log_points)
+    return {t: rs_fit(res["ns"][r], res["rs"][r]) for r, t in enumerate(tickers)}, res["passes"]
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def get_rolling_h(ticker: str, period: str, window: int):
-    df = fetch_prices(ticker, period)
-    prices = df["Close"].values
-    dates = df.index
-    idxs, vals = rolling_hurst_series(prices, window=window)
-    return [str(dates[i].date()) for i in idxs], vals
+def get_h_estimates(tickers: tuple, period: str, method: str) -> dict:
+    """Full-period H per ticker from a non-R/S estimator. Returns {ticker: H or None}."""
+    frames = [fetch_prices(t, period) for t in tickers]
+    H = estimate_hurst_batch(*stack_closes([df["Close"].values for df in frames]), method=method)
+    return {t: None if np.isnan(h) else float(h) for t, h in zip(tickers, H)}
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def get_rs_data(ticker: str, period: str) -> dict:
-    df = fetch_prices(ticker, period)
-    ns, rs = _rs_core(df["Close"].values)
-    if len(ns) < 3:
-        return {}
-    log_n = np.log(ns)
-    log_rs = np.log(rs)
-    coeffs = np.polyfit(log_n, log_rs, 1)
-    H = round(float(coeffs[0]), 4)
-    fitted = list(np.exp(np.polyval(coeffs, log_n)))
-    # Random walk reference (slope = 0.5, same intercept mid-point)
-    intercept_rw = np.mean(log_rs) - 0.5 * np.mean(log_n)
-    rw_fitted = list(np.exp(0.5 * log_n + intercept_rw))
-    return {"ns": ns, "rs": rs, "H": H, "fitted": fitted, "rw_ref": rw_fitted}
+def get_rolling_batch(tickers: tuple, period: str, window: int,
+                      method: str = "R/S", step: int = 3) -> dict:
+    """Rolling H for every ticker in one pass. Returns {ticker: (dates, H_vals)}."""
+    frames = [fetch_prices(t, period) for t in tickers]
+    prices, _ = stack_closes([df["Close"].values for df in frames])
+    rolling = rolling_hurst(prices, window, method)
+
+    out = {}
+    for r, (ticker, df) in enumerate(zip(tickers, frames)):
+        offset = prices.shape[1] - len(df)
+        idxs = np.arange(window, len(df), step)
+        vals = rolling[r, offset + idxs]
+        keep = ~np.isnan(vals)
+        out[ticker] = (
+            [str(df.index[i].date()) for i in idxs[keep]],
+            np.round(vals[keep], 4).tolist(),
+        )
+    return out
 
 
 # ── Interpretation helpers ─────────────────────────────────────────────────────
+REGIME_STYLES = {
+    "Mean-Reverting": ("Mean-Reverting", "#E05C6A", "Prices tend to reverse prior moves. Consistent with a range-bound market."),
+    "Random Walk":    ("Random Walk", "#7A8FA8", "No detectable memory. Consistent with the Efficient Market Hypothesis."),
+    "Persistent":     ("Persistent / Trending", "#00D4AA", "Past trends tend to continue. The market exhibits long memory."),
+}
+
+
 def h_regime(H: float):
-    if H < 0.45:
-        return "Mean-Reverting", "#E05C6A", "Prices tend to reverse prior moves. Consistent with a range-bound market."
-    if H < 0.55:
-        return "Random Walk", "#7A8FA8", "No detectable memory. Consistent with the Efficient Market Hypothesis."
-    return "Persistent / Trending", "#00D4AA", "Past trends tend to continue. The market exhibits long memory."
+    return REGIME_STYLES[classify_regime(H)]
 
 
 # ── Header ────────────────────────────────────────────────────────────────────
@@ -338,7 +341,7 @@ padding-left:1rem;margin-bottom:2rem;max-width:780px;">
 """, unsafe_allow_html=True)
 
 # ── Inputs ────────────────────────────────────────────────────────────────────
-c1, c2, c3, c4 = st.columns([2, 1, 1.2, 0.9])
+c1, c2, c3, c5, c4 = st.columns([2, 1, 1.2, 1.1, 0.9])
 with c1:
     tickers_raw = st.text_input(
         "Tickers (comma-separated)",
@@ -355,6 +358,8 @@ with c3:
     )
     WIN_MAP = {"3 months  (63d)": 63, "6 months (126d)": 126, "1 year   (252d)": 252, "2 years  (504d)": 504}
     rolling_window = WIN_MAP[win_label]
+with c5:
+    method = st.selectbox("Estimator", list(HURST_ESTIMATORS), index=0)
 with c4:
     st.markdown("<div style='height:1.85rem'></div>", unsafe_allow_html=True)
     run = st.button("Calculate H", type="primary", use_container_width=True)
@@ -368,23 +373,21 @@ letter-spacing:0.08em;margin-top:0.3rem;margin-bottom:1.5rem;">
 
 # ── Analysis ──────────────────────────────────────────────────────────────────
 if run:
-    tickers = [t.strip().upper() for t in tickers_raw.split(",") if t.strip()][:5]
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers_raw.split(",") if t.strip()))[:MAX_TICKERS]
 
-    loaded = {}
+    fetched = {}
     errors = []
     prog = st.progress(0, text="Fetching price data...")
-    for i, ticker in enumerate(tickers):
-        prog.progress((i + 1) / len(tickers), text=f"Fetching {ticker}...")
-        try:
-            df = fetch_prices(ticker, period)
-            if len(df) < 100:
-                errors.append(f"{ticker}: insufficient history ({len(df)} days)")
-                continue
-            loaded[ticker] = df
-        except Exception as e:
-            errors.append(f"{ticker}: {str(e)[:60]}")
-        time.sleep(0.08)
+    for i, (ticker, df, err) in enumerate(fetch_all(tickers, period)):
+        prog.progress((i + 1) / len(tickers), text=f"Fetched {ticker}...")
+        if err is not None:
+            errors.append(f"{ticker}: {str(err)[:60]}")
+        elif len(df) < 100:
+            errors.append(f"{ticker}: insufficient history ({len(df)} days)")
+        else:
+            fetched[ticker] = df
     prog.empty()
+    loaded = {t: fetched[t] for t in tickers if t in fetched}
 
     for err in errors:
         st.warning(err)
@@ -392,15 +395,25 @@ if run:
         st.error("No data retrieved. Check your tickers.")
         st.stop()
 
+    with st.spinner(f"Computing H for {len(loaded)} tickers…"):
+        # The R/S estimators read H off the shared pass instead of running another
+        rs_results, rs_passes = get_rs_results(tuple(loaded), period, RS_GRIDS.get(method))
+        if method in RS_GRIDS:
+            h_est = {t: rs_results[t].get("H") for t in loaded}
+        else:
+            h_est = get_h_estimates(tuple(loaded), period, method)
+        rolling_h = get_rolling_batch(tuple(loaded), period, rolling_window, method)
+
     # ── H cards ───────────────────────────────────────────────────────────────
-    st.markdown('<div class="section-label">Hurst Exponent — Full Period</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="section-label">Hurst Exponent — Full Period · {method}</div>', unsafe_allow_html=True)
 
     h_full = {}
-    cols = st.columns(len(loaded))
-    for i, (ticker, df) in enumerate(loaded.items()):
-        H = hurst_rs(df["Close"].values)
+    for i, ticker in enumerate(loaded):
+        if i % CARDS_PER_ROW == 0:
+            cols = st.columns(min(CARDS_PER_ROW, len(loaded) - i))
+        H = h_est[ticker]
         h_full[ticker] = H
-        with cols[i]:
+        with cols[i % CARDS_PER_ROW]:
             if H is not None:
                 regime, color, desc = h_regime(H)
                 st.markdown(f"""
@@ -416,7 +429,7 @@ if run:
                 <div class="h-card" style="--card-accent:#4D6B64;">
                     <div class="h-ticker">{ticker}</div>
                     <div class="h-value" style="color:var(--text-muted);">—</div>
-                    <div class="h-desc">Insufficient data for R/S analysis.</div>
+                    <div class="h-desc">Insufficient data for {method} estimate.</div>
                 </div>
                 """, unsafe_allow_html=True)
 
@@ -428,7 +441,7 @@ if run:
     # ─ Tab 1: Rolling Hurst ───────────────────────────────────────────────────
     with tab1:
         st.markdown(
-            f'<div class="section-label">Rolling H — {rolling_window}-Day Window (computed every 3 days)</div>',
+            f'<div class="section-label">Rolling H — {rolling_window}-Day Window · {method} (computed every 3 days)</div>',
             unsafe_allow_html=True,
         )
 
@@ -450,8 +463,7 @@ if run:
 
         all_loaded = True
         for i, ticker in enumerate(loaded):
-            with st.spinner(f"Computing rolling H for {ticker}…"):
-                dates, H_vals = get_rolling_h(ticker, period, rolling_window)
+            dates, H_vals = rolling_h[ticker]
             if not H_vals:
                 st.warning(f"{ticker}: not enough data for rolling H with {rolling_window}-day window.")
                 all_loaded = False
@@ -483,7 +495,7 @@ if run:
 
         fig2 = go.Figure()
         for i, ticker in enumerate(loaded):
-            rs_data = get_rs_data(ticker, period)
+            rs_data = rs_results[ticker]
             if not rs_data:
                 continue
             color = PALETTE[i % len(PALETTE)]
@@ -504,18 +516,13 @@ if run:
                 showlegend=False,
             ))
 
-        # Random walk reference (slope=0.5)
-        all_ns = []
-        for ticker in loaded:
-            rd = get_rs_data(ticker, period)
-            if rd:
-                all_ns.extend(rd["ns"])
-        if all_ns:
+        # Random walk reference (slope=0.5): the average of each ticker's rw_ref line
+        fits = [rd for rd in rs_results.values() if rd]
+        if fits:
+            all_ns = [n for rd in fits for n in rd["ns"]]
             x_rng = np.linspace(np.log(min(all_ns)), np.log(max(all_ns)), 60)
-            mid_y = np.mean([np.log(get_rs_data(t, period)["rs"]).mean()
-                             for t in loaded if get_rs_data(t, period)])
-            mid_x = np.mean(x_rng)
-            y_rw  = mid_y + 0.5 * (x_rng - mid_x)
+            rw_intercept = np.mean([np.mean(np.log(rd["rw_ref"]) - 0.5 * np.log(rd["ns"])) for rd in fits])
+            y_rw  = rw_intercept + 0.5 * x_rng
             fig2.add_trace(go.Scatter(
                 x=x_rng.tolist(), y=y_rw.tolist(),
                 mode="lines", name="Random walk (H=0.5)",
@@ -570,7 +577,7 @@ if run:
             regime = "—"
         rows.append({
             "Ticker":       ticker,
-            "H (full period)": f"{H:.3f}" if H else "—",
+            f"H ({method})": f"{H:.3f}" if H else "—",
             "Regime":       regime,
             "Data Points":  len(df),
             "Period Start": str(df.index[0].date()),
@@ -578,6 +585,13 @@ if run:
         })
     st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
 
+    st.markdown(f"""
+    <div style="font-family:'JetBrains Mono',monospace;font-size:0.56rem;color:rgba(77,107,100,0.45);
+    text-align:right;margin-top:1.2rem;letter-spacing:0.06em;">
+        {len(loaded)} tickers · {rs_passes} R/S passes behind these results
+    </div>
+    """, unsafe_allow_html=True)
+
 else:
     st.markdown("""
     <div style="text-align:center;padding:5rem 2rem;color:rgba(77,107,100,0.35);">
@@ -0,0 +1,7 @@
+"""
+Standard-library helpers shared by fractal_core and edgar_core. Kept out of
+both so neither package pulls in the other's dependencies.
+"""
+from .ratelimit import TokenBucket
+
+__all__ = ["TokenBucket"]
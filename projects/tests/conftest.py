@@ -0,0 +1,64 @@
+"""
+Shared fixtures: the project packages (and the benchmark suite's synthetic
+data generators) on sys.path, and a local mock HTTP server.
+"""
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+
+class MockServer:
+    """
+    ThreadingHTTPServer on localhost. routes maps a path to a list of
+    responses served in turn (the last one repeats); each response is
+    (status, headers, body), where body may instead be a callable taking the
+    request headers and returning such a tuple. Requests are logged as
+    (path, headers).
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    queue = server.routes.get(self.path, [(404, {}, b"")])
+                    status, headers, body = queue.pop(0) if len(queue) > 1 else queue[0]
+                if callable(body):
+                    status, headers, body = body(self.headers)
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def hits(self, path: str) -> list:
+        """Request headers of every request for path, in order."""
+        return [h for p, h in self.requests if p == path]
+
+
+@pytest.fixture
+def mock_server():
+    server = MockServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from fractal_core.backtest import backtest_positions
+
+COST = 10.0  # bps, 0.001 per unit traded
+
+
+def test_round_trip_cost_is_charged_to_the_trade():
+    # One long held over a +0.15% bar: up gross, down after 0.1% in and 0.1% out
+    close = np.array([100.0, 100.0, 100.0, 100.15, 100.15, 100.15])
+    pos = np.array([0, 1, 1, 0, 0, 0])
+    stats = backtest_positions(close, pos, cost_bps=COST)
+    assert stats["trades"][0] == 1
+    assert stats["hit_rate"][0] == 0.0
+    assert stats["total_return"][0] == pytest.approx((1 - 0.001) * 1.0015 * (1 - 0.001) - 1)
+
+
+def test_flip_charges_closing_leg_to_the_closed_trade():
+    # Long gains 0.15% then flips short, which gains 0.25%. With the closing
+    # leg on the long, only the short nets a profit.
+    close = np.array([100.0, 100.0, 100.15, 100.15 * 0.9975])
+    pos = np.array([0, 1, -1, -1])
+    stats = backtest_positions(close, pos, cost_bps=COST)
+    assert stats["trades"][0] == 2
+    assert stats["hit_rate"][0] == 0.5
+    assert stats["turnover"][0] == pytest.approx(3 / (3 / 252))
+
+
+def test_open_trade_counts_without_exit_cost():
+    close = np.array([100.0, 100.0, 100.15, 100.15])
+    stats = backtest_positions(close, np.array([0, 1, 1, 1]), cost_bps=COST)
+    assert stats["hit_rate"][0] == 1.0
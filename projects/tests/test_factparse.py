@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from edgar_core.factparse import select_facts_bytes
+
+synthetic = pytest.importorskip("synthetic")
+
+CONCEPTS = ("Revenues", "NetIncomeLoss")
+
+
+@pytest.fixture(scope="module")
+def payload():
+    facts = synthetic.companyfacts(20, years=3, concepts=CONCEPTS)
+    facts.update(cik=320193, entityName='Apple "Inc."')
+    return facts
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_chunk_size_does_not_change_the_result(payload, chunk_size):
+    got = select_facts_bytes(json.dumps(payload).encode(), CONCEPTS + ("Missing",), chunk_size=chunk_size)
+    assert got == {
+        "cik": 320193,
+        "entityName": 'Apple "Inc."',
+        "facts": {"us-gaap": {c: payload["facts"]["us-gaap"][c] for c in CONCEPTS}},
+    }
+
+
+def test_stream_without_concepts_is_none():
+    assert select_facts_bytes(b'{"cik": 1, "entityName": "X", "facts": {}}', CONCEPTS, chunk_size=7) is None
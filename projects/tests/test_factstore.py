@@ -0,0 +1,92 @@
+import json
+import zipfile
+
+import pytest
+
+from edgar_core import factstore
+
+synthetic = pytest.importorskip("synthetic")
+
+CONCEPTS = ("Revenues", "NetIncomeLoss")
+
+
+@pytest.fixture
+def archives(tmp_path):
+    """Bulk-layout fixtures standing in for the SEC download."""
+    return synthetic.edgar_archives(tmp_path / "bulk", n_companies=4, n_concepts=12, concepts=CONCEPTS)
+
+
+@pytest.fixture
+def store(tmp_path):
+    con = factstore.open_store(tmp_path / "facts.sqlite")
+    yield con
+    con.close()
+
+
+def _rewrite(path, replace: dict):
+    """Rewrite a zip in place with some members' JSON replaced."""
+    with zipfile.ZipFile(path) as zf:
+        members = {i.filename: zf.read(i) for i in zf.infolist()}
+    members.update({m: json.dumps(payload).encode() for m, payload in replace.items()})
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+
+
+def _payload(path, member: str) -> dict:
+    with zipfile.ZipFile(path) as zf:
+        return json.loads(zf.read(member))
+
+
+def test_ingest_loads_companies_filings_and_annual_facts(archives, store):
+    for kind in ("companyfacts", "submissions"):
+        assert factstore.ingest_archive(store, kind, archives[kind]) == {"members": 4, "parsed": 4, "failed": 0}
+
+    assert factstore.ticker_map(store)["SYN2"] == {"cik": "0000001002", "name": "SYNTHETIC CORP 2"}
+    info = factstore.company_info(store, 1002)
+    assert info["sic"] == "7372"
+    assert len(info["filings"]["recent"]["form"]) == factstore.RECENT_FILINGS
+
+    facts = factstore.company_facts(store, 1002, CONCEPTS)
+    assert set(facts["facts"]["us-gaap"]) == set(CONCEPTS)
+    payload = _payload(archives["companyfacts"], "CIK0000001002.json")
+    # One value per fiscal year, the last FY 10-K row reported for it
+    expected = {}
+    for d in payload["facts"]["us-gaap"]["Revenues"]["units"]["USD"]:
+        if d["form"] == "10-K" and d["fp"] == "FY":
+            expected[d["end"][:4]] = (d["end"], d["val"])
+    rows = facts["facts"]["us-gaap"]["Revenues"]["units"]["USD"]
+    assert [(r["end"], r["val"]) for r in rows] == [expected[y] for y in sorted(expected)]
+
+
+def test_reingest_parses_only_changed_members(archives, store):
+    path = archives["companyfacts"]
+    factstore.ingest_archive(store, "companyfacts", path)
+    assert factstore.ingest_archive(store, "companyfacts", path)["parsed"] == 0
+
+    changed = _payload(path, "CIK0000001001.json")
+    for d in changed["facts"]["us-gaap"]["Revenues"]["units"]["USD"]:
+        d["val"] = 7
+    _rewrite(path, {"CIK0000001001.json": changed})
+
+    assert factstore.ingest_archive(store, "companyfacts", path) == {"members": 4, "parsed": 1, "failed": 0}
+    revenues = factstore.company_facts(store, 1001, ["Revenues"])["facts"]["us-gaap"]["Revenues"]
+    assert {r["val"] for r in revenues["units"]["USD"]} == {7}
+    # Untouched companies keep their rows
+    assert factstore.company_facts(store, 1000, ["Revenues"]) is not None
+
+
+def test_unreadable_member_is_counted_and_retried(archives, store):
+    path = archives["companyfacts"]
+    with zipfile.ZipFile(path, "a") as zf:
+        zf.writestr("CIK0000009999.json", b"{not json")
+    assert factstore.ingest_archive(store, "companyfacts", path) == {"members": 5, "parsed": 4, "failed": 1}
+    # Its CRC was not recorded, so the next ingest tries it again
+    assert factstore.ingest_archive(store, "companyfacts", path)["failed"] == 1
+
+
+def test_company_without_requested_concepts_is_not_missing(archives, store):
+    factstore.ingest_archive(store, "companyfacts", archives["companyfacts"])
+    facts = factstore.company_facts(store, 1000, ["NoSuchConcept"])
+    assert facts == {"cik": 1000, "facts": {"us-gaap": {}}}
+    assert factstore.company_facts(store, 4242, ["Revenues"]) is None
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from fractal_core import hurst
+
+synthetic = pytest.importorskip("synthetic")
+reference = pytest.importorskip("reference")
+
+
+@pytest.mark.parametrize("kind", sorted(synthetic.PATHS))
+def test_rs_core_matches_loop_reference(kind):
+    prices = synthetic.PATHS[kind](2_000, seed=3)
+    prices[500:700] = prices[499]  # flat stretch: chunks with zero std are skipped
+    ns, rs = hurst._rs_core(prices)
+    ref_ns, ref_rs = reference.rs_core_loop(prices)
+    assert ns == ref_ns
+    np.testing.assert_allclose(rs, ref_rs, rtol=1e-12)
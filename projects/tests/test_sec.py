@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from edgar_core.sec import SEC_RATE, SECClient
+
+
+def _client(**kwargs) -> SECClient:
+    # A high rate and short backoff unless the test is about them
+    return SECClient(**{"rate": 1000, "backoff": 0.01, "retries": 3, **kwargs})
+
+
+def test_retry_after_then_success(mock_server):
+    mock_server.routes["/busy"] = [(503, {"Retry-After": "1"}, b""), (200, {}, b"ok")]
+    client = _client(backoff=10)
+    t0 = time.monotonic()
+    r = client.get(mock_server.url + "/busy")
+    elapsed = time.monotonic() - t0
+    assert r.status_code == 200 and r.text == "ok"
+    # Waited the server's Retry-After, not the 10 s backoff
+    assert 1 <= elapsed < 5
+    assert client.stats == {"requests": 2, "retries": 1, "not_modified": 0}
+
+
+def test_429_on_every_attempt_returns_last_response(mock_server):
+    mock_server.routes["/limited"] = [(429, {}, b"slow down")]
+    client = _client(retries=2)
+    r = client.get(mock_server.url + "/limited")
+    assert r.status_code == 429
+    assert len(mock_server.hits("/limited")) == 3
+    assert client.stats["retries"] == 2
+
+
+def test_etag_304_is_replayed_from_cache(mock_server):
+    def conditional(headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"ETag": '"v1"', "Content-Type": "application/json"}, b'{"n": 1}'
+
+    mock_server.routes["/facts"] = [(200, {}, conditional)]
+    client = _client()
+    first = client.get(mock_server.url + "/facts")
+    second = client.get(mock_server.url + "/facts")
+    assert first.status_code == second.status_code == 200
+    assert second.json() == {"n": 1}
+    hits = mock_server.hits("/facts")
+    assert "If-None-Match" not in hits[0] and hits[1]["If-None-Match"] == '"v1"'
+    assert client.stats["not_modified"] == 1
+
+
+def test_streamed_responses_bypass_the_cache(mock_server):
+    mock_server.routes["/bulk"] = [(200, {"ETag": '"v1"'}, b"x" * 100_000)]
+    client = _client()
+    for _ in range(2):
+        with client.get(mock_server.url + "/bulk", stream=True) as r:
+            assert sum(len(c) for c in r.iter_content(1 << 14)) == 100_000
+    assert all("If-None-Match" not in h for h in mock_server.hits("/bulk"))
+    assert client.stats["not_modified"] == 0
+
+
+def test_rate_limit_holds_across_threads(mock_server):
+    mock_server.routes["/x"] = [(200, {}, b"")]
+    client = SECClient(rate=SEC_RATE)
+    n = 2 * int(SEC_RATE) + 1
+
+    def worker(count):
+        for _ in range(count):
+            client.get(mock_server.url + "/x")
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in (n // 4,) * 3 + (n - 3 * (n // 4),)]
+    t0 = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - t0
+    # burst=1: n requests need n - 1 intervals of 1 / SEC_RATE
+    assert elapsed >= (n - 1) / SEC_RATE * 0.95
+    assert len(mock_server.hits("/x")) == n